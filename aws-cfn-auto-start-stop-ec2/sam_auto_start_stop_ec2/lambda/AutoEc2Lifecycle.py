@@ -0,0 +1,71 @@
+import logging
+from ec2_utils import (
+    configure_logging,
+    get_ec2_client,
+    warm_ec2_connection,
+    get_event_instance_ids,
+    iter_instances_by_tag,
+    batch_instance_ids,
+    start_ec2_instances,
+    stop_ec2_instances
+)
+
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
+
+# Create the EC2 client once per execution environment so warm start and stop invocations share it
+try:
+    _EC2_CLIENT = get_ec2_client()
+    warm_ec2_connection(_EC2_CLIENT)
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2 client: %s", e)
+    raise
+
+# Tag values that mark an instance for auto-start/auto-stop
+_AUTO_TAG_VALUES = ('TRUE', 'True', 'true')
+
+# action -> (tag name, state the instances must be in, EC2 call)
+_ACTIONS = {
+    'start': ('AutoStart', 'stopped', start_ec2_instances),
+    'stop': ('AutoStop', 'running', stop_ec2_instances),
+}
+
+
+def lambda_handler(event, context):
+    action = (event or {}).get('action')
+    if action not in _ACTIONS:
+        logger.error("Invalid action %r, expected one of %s", action, sorted(_ACTIONS))
+        raise ValueError(f"Invalid action: {action!r}")
+
+    tag_name, instance_state, change_state = _ACTIONS[action]
+
+    try:
+        # Stream matching instances and change their state batch by batch as pages arrive
+        instances = []
+        matching_ids = iter_instances_by_tag(
+            ec2_client=_EC2_CLIENT,
+            tag_name=tag_name,
+            tag_values=_AUTO_TAG_VALUES,
+            instance_states=[instance_state],
+            instance_ids=get_event_instance_ids(event)
+        )
+
+        for batch in batch_instance_ids(matching_ids):
+            change_state(_EC2_CLIENT, batch)
+            instances.extend(batch)
+
+        logger.info("Found %s %s instances with %s tag: %s", len(instances), instance_state, tag_name, instances)
+
+        if instances:
+            logger.info("Successfully initiated %s for instances: %s", action, instances)
+        else:
+            logger.info("No instances found in %s state with %s tag", instance_state, tag_name)
+
+        return {
+            'statusCode': 200,
+            'body': f'Processed {len(instances)} instances for auto-{action}'
+        }
+
+    except Exception as e:
+        logger.error("Error in AutoEc2Lifecycle (%s): %s", action, e)
+        raise
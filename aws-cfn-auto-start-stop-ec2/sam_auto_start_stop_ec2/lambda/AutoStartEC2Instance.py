@@ -1,24 +1,49 @@
-from ec2_utils import configure_logging, get_ec2_client, get_instances_by_tag, start_ec2_instances
+import logging
+from ec2_utils import (
+    configure_logging,
+    get_ec2_client,
+    warm_ec2_connection,
+    get_event_instance_ids,
+    iter_instances_by_tag,
+    batch_instance_ids,
+    start_ec2_instances
+)
+
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
+
+# Create the EC2 client once per execution environment so warm invocations reuse it
+try:
+    _EC2_CLIENT = get_ec2_client()
+    warm_ec2_connection(_EC2_CLIENT)
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2 client: %s", e)
+    raise
+
+# Tag values that mark an instance for auto-start
+_AUTO_START_VALUES = ('TRUE', 'True', 'true')
+
 
 def lambda_handler(event, context):
-    logger = configure_logging()
-    
     try:
-        ec2_client = get_ec2_client()
-        
-        # Get stopped instances with AutoStart tag
-        stopped_instances = get_instances_by_tag(
-            ec2_client=ec2_client,
+        # Stream stopped instances with AutoStart tag and start them batch by batch as pages arrive
+        stopped_instances = []
+        matching_ids = iter_instances_by_tag(
+            ec2_client=_EC2_CLIENT,
             tag_name='AutoStart',
-            tag_values=['TRUE', 'True', 'true'],
-            instance_states=['stopped']
+            tag_values=_AUTO_START_VALUES,
+            instance_states=['stopped'],
+            instance_ids=get_event_instance_ids(event)
         )
         
-        logger.info(f"Found {len(stopped_instances)} stopped instances with AutoStart tag: {stopped_instances}")
+        for batch in batch_instance_ids(matching_ids):
+            start_ec2_instances(_EC2_CLIENT, batch)
+            stopped_instances.extend(batch)
+        
+        logger.info("Found %s stopped instances with AutoStart tag: %s", len(stopped_instances), stopped_instances)
         
         if stopped_instances:
-            start_ec2_instances(ec2_client, stopped_instances)
-            logger.info(f"Successfully initiated start for instances: {stopped_instances}")
+            logger.info("Successfully initiated start for instances: %s", stopped_instances)
         else:
             logger.info("No instances found in stopped state with AutoStart tag")
             
@@ -28,5 +53,5 @@ def lambda_handler(event, context):
         }
         
     except Exception as e:
-        logger.error(f"Error in AutoStartEC2Instance: {str(e)}")
+        logger.error("Error in AutoStartEC2Instance: %s", e)
         raise
@@ -10,16 +10,44 @@ Python: 3.11+
 """
 
 import json
-from typing import Dict, Any
+import logging
+import os
 from ec2_utils_improved import (
     EC2Manager,
     TagValidator,
     create_lambda_response,
+    get_event_instance_ids,
     configure_logging
 )
 
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+# Create the EC2 manager once per execution environment so warm invocations reuse its client
+try:
+    _EC2_MANAGER = EC2Manager()
+    _EC2_MANAGER.warm_connection()
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2Manager: %s", e, exc_info=True)
+    raise
+
+# Detailed search criteria/diagnostics in responses are opt-in to keep the body small
+_VERBOSE_RESPONSE = os.environ.get('LAMBDA_VERBOSE_RESPONSE', '0') == '1'
+
+# Canonical (lowercased) tag values that indicate auto-start should be enabled
+_TRUE_SET = TagValidator.BOOLEAN_TRUE_VALUES
+# Same values as an immutable, ordered tuple for the response search criteria
+_AUTO_START_VALUES = tuple(sorted(_TRUE_SET))
+
+# Search criteria reported in verbose responses; constant for the life of the module
+_SEARCH_CRITERIA = {
+    'tag_name': 'AutoStart',
+    'tag_values': list(_AUTO_START_VALUES),
+    'instance_states': ['stopped']
+}
+
+
+def lambda_handler(event: dict, context: object) -> dict:
     """
     Lambda handler for auto-starting EC2 instances
     
@@ -30,27 +58,27 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response with operation results
     """
-    logger = configure_logging()
-    
     try:
         logger.info("Starting AutoStartEC2Instance function")
-        logger.info(f"Event: {json.dumps(event, default=str)}")
-        
-        # Initialize EC2 manager
-        ec2_manager = EC2Manager()
-        
-        # Define tag values that indicate auto-start should be enabled
-        auto_start_values = ['TRUE', 'True', 'true', '1', 'yes', 'Yes', 'YES', 'on', 'On', 'ON']
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event: %s", json.dumps(event, default=str))
         
         # Get stopped instances with AutoStart tag
         logger.info("Searching for stopped instances with AutoStart tag")
-        stopped_instances = ec2_manager.get_instances_by_tag(
+        tagged_instances = _EC2_MANAGER.get_instances_by_tag(
             tag_name='AutoStart',
-            tag_values=auto_start_values,
-            instance_states=['stopped']
+            tag_values=['*'],
+            instance_states=['stopped'],
+            instance_ids=get_event_instance_ids(event)
         )
         
-        logger.info(f"Found {len(stopped_instances)} stopped instances with AutoStart tag")
+        # Match the tag value case-insensitively rather than enumerating case variants
+        stopped_instances = [
+            instance for instance in tagged_instances
+            if str(instance.tags.get('AutoStart', '')).strip().lower() in _TRUE_SET
+        ]
+        
+        logger.info("Found %s stopped instances with AutoStart tag", len(stopped_instances))
         
         if not stopped_instances:
             logger.info("No instances found in stopped state with AutoStart tag")
@@ -60,40 +88,40 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 action='auto_start',
                 additional_info={
                     'message': 'No instances found in stopped state with AutoStart tag',
-                    'search_criteria': {
-                        'tag_name': 'AutoStart',
-                        'tag_values': auto_start_values,
-                        'instance_states': ['stopped']
-                    }
+                    **({'search_criteria': _SEARCH_CRITERIA} if _VERBOSE_RESPONSE else {})
                 }
             )
         
         # Log instance details for monitoring
-        for instance in stopped_instances:
-            logger.info(
-                f"Instance to start: {instance.instance_id} "
-                f"(Type: {instance.instance_type}, AZ: {instance.availability_zone})"
-            )
+        if logger.isEnabledFor(logging.DEBUG):
+            for instance in stopped_instances:
+                logger.debug(
+                    "Instance to start: %s (Type: %s, AZ: %s)",
+                    instance.instance_id, instance.instance_type, instance.availability_zone
+                )
         
         # Start the instances
-        logger.info(f"Attempting to start {len(stopped_instances)} instances")
-        results = ec2_manager.start_instances(stopped_instances)
+        logger.info("Attempting to start %s instances", len(stopped_instances))
+        results = _EC2_MANAGER.start_instances(stopped_instances)
         
         # Log results summary
-        successful_starts = [r for r in results if r.success]
-        failed_starts = [r for r in results if not r.success]
+        successful_starts, failed_starts = [], []
+        add_success, add_failure = successful_starts.append, failed_starts.append
+        for result in results:
+            (add_success if result.success else add_failure)(result)
         
-        logger.info(f"Start operation completed: {len(successful_starts)} successful, {len(failed_starts)} failed")
+        logger.info("Start operation completed: %s successful, %s failed", len(successful_starts), len(failed_starts))
         
         # Log successful starts
-        for result in successful_starts:
-            logger.info(f"Successfully started instance: {result.instance_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for result in successful_starts:
+                logger.debug("Successfully started instance: %s", result.instance_id)
         
         # Log failed starts with details
         for result in failed_starts:
             logger.error(
-                f"Failed to start instance {result.instance_id}: "
-                f"{result.message} (Error code: {result.error_code})"
+                "Failed to start instance %s: %s (Error code: %s)",
+                result.instance_id, result.message, result.error_code
             )
         
         # Determine response status code
@@ -108,20 +136,16 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             action='auto_start',
             additional_info={
                 'function_name': 'AutoStartEC2Instance',
-                'search_criteria': {
-                    'tag_name': 'AutoStart',
-                    'tag_values': auto_start_values,
-                    'instance_states': ['stopped']
-                },
+                'search_criteria': _SEARCH_CRITERIA,
                 'instances_found': len(stopped_instances)
-            }
+            } if _VERBOSE_RESPONSE else None
         )
         
-        logger.info(f"Function completed successfully. Response status: {status_code}")
+        logger.info("Function completed successfully. Response status: %s", status_code)
         return response
         
     except Exception as e:
-        logger.error(f"Unexpected error in AutoStartEC2Instance: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in AutoStartEC2Instance: %s", e, exc_info=True)
         
         # Create error response
         error_response = create_lambda_response(
@@ -1,24 +1,49 @@
-from ec2_utils import configure_logging, get_ec2_client, get_instances_by_tag, stop_ec2_instances
+import logging
+from ec2_utils import (
+    configure_logging,
+    get_ec2_client,
+    warm_ec2_connection,
+    get_event_instance_ids,
+    iter_instances_by_tag,
+    batch_instance_ids,
+    stop_ec2_instances
+)
+
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
+
+# Create the EC2 client once per execution environment so warm invocations reuse it
+try:
+    _EC2_CLIENT = get_ec2_client()
+    warm_ec2_connection(_EC2_CLIENT)
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2 client: %s", e)
+    raise
+
+# Tag values that mark an instance for auto-stop
+_AUTO_STOP_VALUES = ('TRUE', 'True', 'true')
+
 
 def lambda_handler(event, context):
-    logger = configure_logging()
-    
     try:
-        ec2_client = get_ec2_client()
-        
-        # Get running instances with AutoStop tag
-        running_instances = get_instances_by_tag(
-            ec2_client=ec2_client,
+        # Stream running instances with AutoStop tag and stop them batch by batch as pages arrive
+        running_instances = []
+        matching_ids = iter_instances_by_tag(
+            ec2_client=_EC2_CLIENT,
             tag_name='AutoStop',
-            tag_values=['TRUE', 'True', 'true'],
-            instance_states=['running']
+            tag_values=_AUTO_STOP_VALUES,
+            instance_states=['running'],
+            instance_ids=get_event_instance_ids(event)
         )
         
-        logger.info(f"Found {len(running_instances)} running instances with AutoStop tag: {running_instances}")
+        for batch in batch_instance_ids(matching_ids):
+            stop_ec2_instances(_EC2_CLIENT, batch)
+            running_instances.extend(batch)
+        
+        logger.info("Found %s running instances with AutoStop tag: %s", len(running_instances), running_instances)
         
         if running_instances:
-            stop_ec2_instances(ec2_client, running_instances)
-            logger.info(f"Successfully initiated stop for instances: {running_instances}")
+            logger.info("Successfully initiated stop for instances: %s", running_instances)
         else:
             logger.info("No instances found in running state with AutoStop tag")
             
@@ -28,5 +53,5 @@ def lambda_handler(event, context):
         }
         
     except Exception as e:
-        logger.error(f"Error in AutoStopEC2Instance: {str(e)}")
+        logger.error("Error in AutoStopEC2Instance: %s", e)
         raise
@@ -10,16 +10,44 @@ Python: 3.11+
 """
 
 import json
-from typing import Dict, Any
+import logging
+import os
 from ec2_utils_improved import (
     EC2Manager,
     TagValidator,
     create_lambda_response,
+    get_event_instance_ids,
     configure_logging
 )
 
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+# Create the EC2 manager once per execution environment so warm invocations reuse its client
+try:
+    _EC2_MANAGER = EC2Manager()
+    _EC2_MANAGER.warm_connection()
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2Manager: %s", e, exc_info=True)
+    raise
+
+# Detailed search criteria/diagnostics in responses are opt-in to keep the body small
+_VERBOSE_RESPONSE = os.environ.get('LAMBDA_VERBOSE_RESPONSE', '0') == '1'
+
+# Canonical (lowercased) tag values that indicate auto-stop should be enabled
+_TRUE_SET = TagValidator.BOOLEAN_TRUE_VALUES
+# Same values as an immutable, ordered tuple for the response search criteria
+_AUTO_STOP_VALUES = tuple(sorted(_TRUE_SET))
+
+# Search criteria reported in verbose responses; constant for the life of the module
+_SEARCH_CRITERIA = {
+    'tag_name': 'AutoStop',
+    'tag_values': list(_AUTO_STOP_VALUES),
+    'instance_states': ['running']
+}
+
+
+def lambda_handler(event: dict, context: object) -> dict:
     """
     Lambda handler for auto-stopping EC2 instances
     
@@ -30,27 +58,27 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response with operation results
     """
-    logger = configure_logging()
-    
     try:
         logger.info("Starting AutoStopEC2Instance function")
-        logger.info(f"Event: {json.dumps(event, default=str)}")
-        
-        # Initialize EC2 manager
-        ec2_manager = EC2Manager()
-        
-        # Define tag values that indicate auto-stop should be enabled
-        auto_stop_values = ['TRUE', 'True', 'true', '1', 'yes', 'Yes', 'YES', 'on', 'On', 'ON']
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event: %s", json.dumps(event, default=str))
         
         # Get running instances with AutoStop tag
         logger.info("Searching for running instances with AutoStop tag")
-        running_instances = ec2_manager.get_instances_by_tag(
+        tagged_instances = _EC2_MANAGER.get_instances_by_tag(
             tag_name='AutoStop',
-            tag_values=auto_stop_values,
-            instance_states=['running']
+            tag_values=['*'],
+            instance_states=['running'],
+            instance_ids=get_event_instance_ids(event)
         )
         
-        logger.info(f"Found {len(running_instances)} running instances with AutoStop tag")
+        # Match the tag value case-insensitively rather than enumerating case variants
+        running_instances = [
+            instance for instance in tagged_instances
+            if str(instance.tags.get('AutoStop', '')).strip().lower() in _TRUE_SET
+        ]
+        
+        logger.info("Found %s running instances with AutoStop tag", len(running_instances))
         
         if not running_instances:
             logger.info("No instances found in running state with AutoStop tag")
@@ -60,40 +88,40 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 action='auto_stop',
                 additional_info={
                     'message': 'No instances found in running state with AutoStop tag',
-                    'search_criteria': {
-                        'tag_name': 'AutoStop',
-                        'tag_values': auto_stop_values,
-                        'instance_states': ['running']
-                    }
+                    **({'search_criteria': _SEARCH_CRITERIA} if _VERBOSE_RESPONSE else {})
                 }
             )
         
         # Log instance details for monitoring
-        for instance in running_instances:
-            logger.info(
-                f"Instance to stop: {instance.instance_id} "
-                f"(Type: {instance.instance_type}, AZ: {instance.availability_zone})"
-            )
+        if logger.isEnabledFor(logging.DEBUG):
+            for instance in running_instances:
+                logger.debug(
+                    "Instance to stop: %s (Type: %s, AZ: %s)",
+                    instance.instance_id, instance.instance_type, instance.availability_zone
+                )
         
         # Stop the instances
-        logger.info(f"Attempting to stop {len(running_instances)} instances")
-        results = ec2_manager.stop_instances(running_instances)
+        logger.info("Attempting to stop %s instances", len(running_instances))
+        results = _EC2_MANAGER.stop_instances(running_instances)
         
         # Log results summary
-        successful_stops = [r for r in results if r.success]
-        failed_stops = [r for r in results if not r.success]
+        successful_stops, failed_stops = [], []
+        add_success, add_failure = successful_stops.append, failed_stops.append
+        for result in results:
+            (add_success if result.success else add_failure)(result)
         
-        logger.info(f"Stop operation completed: {len(successful_stops)} successful, {len(failed_stops)} failed")
+        logger.info("Stop operation completed: %s successful, %s failed", len(successful_stops), len(failed_stops))
         
         # Log successful stops
-        for result in successful_stops:
-            logger.info(f"Successfully stopped instance: {result.instance_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for result in successful_stops:
+                logger.debug("Successfully stopped instance: %s", result.instance_id)
         
         # Log failed stops with details
         for result in failed_stops:
             logger.error(
-                f"Failed to stop instance {result.instance_id}: "
-                f"{result.message} (Error code: {result.error_code})"
+                "Failed to stop instance %s: %s (Error code: %s)",
+                result.instance_id, result.message, result.error_code
             )
         
         # Determine response status code
@@ -108,20 +136,16 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             action='auto_stop',
             additional_info={
                 'function_name': 'AutoStopEC2Instance',
-                'search_criteria': {
-                    'tag_name': 'AutoStop',
-                    'tag_values': auto_stop_values,
-                    'instance_states': ['running']
-                },
+                'search_criteria': _SEARCH_CRITERIA,
                 'instances_found': len(running_instances)
-            }
+            } if _VERBOSE_RESPONSE else None
         )
         
-        logger.info(f"Function completed successfully. Response status: {status_code}")
+        logger.info("Function completed successfully. Response status: %s", status_code)
         return response
         
     except Exception as e:
-        logger.error(f"Unexpected error in AutoStopEC2Instance: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in AutoStopEC2Instance: %s", e, exc_info=True)
         
         # Create error response
         error_response = create_lambda_response(
@@ -1,49 +1,70 @@
 import datetime
+import logging
 from ec2_utils import (
     configure_logging, 
     get_ec2_client, 
-    set_region_timezone, 
+    warm_ec2_connection,
+    get_region_timezone, 
+    get_timezone_info,
     get_instances_by_time_tag, 
     process_time_based_instances
 )
 
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
+
+# Create the EC2 client once per execution environment so warm invocations reuse it
+try:
+    _EC2_CLIENT = get_ec2_client()
+    warm_ec2_connection(_EC2_CLIENT)
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2 client: %s", e)
+    raise
+
+# The timezone does not change for the life of the execution environment, so resolve it once
+_TIMEZONE = get_region_timezone()
+_TZ = get_timezone_info(_TIMEZONE)
+
+
 def lambda_handler(event, context):
-    logger = configure_logging()
-    
     try:
-        # Set timezone
-        timezone = set_region_timezone()
+        timezone = _TIMEZONE
         
         # Get current time
-        current_time = datetime.datetime.now()
+        current_time = datetime.datetime.now(_TZ)
         weekday = current_time.isoweekday()  # Monday is 1, Sunday is 7
         
-        logger.info(f"Current time: {current_time}, Weekday: {weekday}, Timezone: {timezone}")
+        logger.info("Current time: %s, Weekday: %s, Timezone: %s", current_time, weekday, timezone)
         
-        # Get EC2 client
-        ec2_client = get_ec2_client()
+        # Skip the EC2 scan entirely outside Monday to Friday
+        if not (1 <= weekday <= 5):
+            logger.info("Not a weekday (current: %s), skipping execution", weekday)
+            return {
+                'statusCode': 200,
+                'body': f'Not a weekday (current day: {weekday}), no instances processed'
+            }
         
         # Get instances with StopWeekDay tag that match current time (weekdays only)
         matching_instances = get_instances_by_time_tag(
-            ec2_client=ec2_client,
+            ec2_client=_EC2_CLIENT,
             tag_name='StopWeekDay',
             current_time=current_time,
             time_window_minutes=5,
             weekday_filter=(1, 5)  # Monday to Friday
         )
         
-        logger.info(f"Found {len(matching_instances)} instances with matching StopWeekDay schedule")
+        logger.info("Found %s instances with matching StopWeekDay schedule", len(matching_instances))
         
         if matching_instances:
             # Process instances that are in 'running' state
             processed_count = process_time_based_instances(
-                ec2_client=ec2_client,
+                ec2_client=_EC2_CLIENT,
                 instances_data=matching_instances,
                 target_state='running',
                 action='stop'
             )
             
-            logger.info(f"Successfully processed {processed_count} instances for stop")
+            logger.info("Successfully processed %s instances for stop", processed_count)
         else:
             logger.info("No instances found with matching StopWeekDay schedule")
         
@@ -53,5 +74,5 @@ def lambda_handler(event, context):
         }
         
     except Exception as e:
-        logger.error(f"Error in EC2StopWeekDay: {str(e)}")
+        logger.error("Error in EC2StopWeekDay: %s", e)
         raise
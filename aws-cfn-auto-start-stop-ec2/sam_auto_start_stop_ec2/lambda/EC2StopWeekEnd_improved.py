@@ -10,8 +10,9 @@ Python: 3.11+
 """
 
 import json
+import logging
+import os
 import datetime
-from typing import Dict, Any
 from ec2_utils_improved import (
     EC2Manager,
     TimezoneManager,
@@ -20,8 +21,34 @@ from ec2_utils_improved import (
     configure_logging
 )
 
+# Configure logging once per execution environment rather than on every invocation
+logger = configure_logging()
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+# Create the EC2 manager once per execution environment so warm invocations reuse its client
+try:
+    _EC2_MANAGER = EC2Manager()
+    _EC2_MANAGER.warm_connection()
+except Exception as e:
+    logging.getLogger().error("Failed to initialize EC2Manager: %s", e, exc_info=True)
+    raise
+
+# Detailed search criteria/diagnostics in responses are opt-in to keep the body small
+_VERBOSE_RESPONSE = os.environ.get('LAMBDA_VERBOSE_RESPONSE', '0') == '1'
+
+# The timezone does not change for the life of the execution environment, so resolve it once
+_TIMEZONE_MANAGER = TimezoneManager(logging.getLogger(__name__))
+_TIMEZONE = _TIMEZONE_MANAGER.resolve_timezone()
+_TZ = _TIMEZONE_MANAGER.get_tzinfo(_TIMEZONE)
+
+# Search criteria reported in verbose responses; constant for the life of the module
+_SEARCH_CRITERIA = {
+    'tag_name': 'StopWeekEnd',
+    'time_window_minutes': 5,
+    'weekday_filter': [6, 7]
+}
+
+
+def lambda_handler(event: dict, context: object) -> dict:
     """
     Lambda handler for stopping EC2 instances on weekends based on time tags
     
@@ -32,35 +59,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response with operation results
     """
-    logger = configure_logging()
-    
     try:
         logger.info("Starting EC2StopWeekEnd function")
-        logger.info(f"Event: {json.dumps(event, default=str)}")
-        
-        # Initialize managers
-        ec2_manager = EC2Manager()
-        timezone_manager = TimezoneManager(logger)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event: %s", json.dumps(event, default=str))
         
-        # Set timezone
-        timezone = timezone_manager.set_timezone()
+        timezone = _TIMEZONE
         
         # Get current time and validate it's a weekend
-        current_time = datetime.datetime.now()
+        current_time = datetime.datetime.now(_TZ)
         weekday = current_time.isoweekday()  # Monday is 1, Sunday is 7
+        current_time_iso = current_time.isoformat()
         
-        logger.info(f"Current time: {current_time}, Weekday: {weekday}, Timezone: {timezone}")
+        logger.info("Current time: %s, Weekday: %s, Timezone: %s", current_time, weekday, timezone)
         
         # Check if it's a weekend (Saturday to Sunday)
         if not (6 <= weekday <= 7):
-            logger.info(f"Not a weekend (current: {weekday}), skipping execution")
+            logger.info("Not a weekend (current: %s), skipping execution", weekday)
             return create_lambda_response(
                 status_code=200,
                 results=[],
                 action='stop_weekend',
                 additional_info={
                     'message': f'Not a weekend (current day: {weekday})',
-                    'current_time': current_time.isoformat(),
+                    'current_time': current_time_iso,
                     'timezone': timezone,
                     'weekday': weekday
                 }
@@ -68,14 +90,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         # Get instances with StopWeekEnd tag that match current time
         logger.info("Searching for instances with matching StopWeekEnd schedule")
-        matching_instances = ec2_manager.get_instances_by_time_tag(
+        matching_instances = _EC2_MANAGER.get_instances_by_time_tag(
             tag_name='StopWeekEnd',
             current_time=current_time,
             time_window_minutes=5,
             weekday_filter=(6, 7)  # Saturday to Sunday
         )
         
-        logger.info(f"Found {len(matching_instances)} instances with matching StopWeekEnd schedule")
+        logger.info("Found %s instances with matching StopWeekEnd schedule", len(matching_instances))
         
         if not matching_instances:
             logger.info("No instances found with matching StopWeekEnd schedule")
@@ -85,14 +107,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 action='stop_weekend',
                 additional_info={
                     'message': 'No instances found with matching StopWeekEnd schedule',
-                    'current_time': current_time.isoformat(),
+                    'current_time': current_time_iso,
                     'timezone': timezone,
                     'weekday': weekday,
-                    'search_criteria': {
-                        'tag_name': 'StopWeekEnd',
-                        'time_window_minutes': 5,
-                        'weekday_filter': [6, 7]
-                    }
+                    **({'search_criteria': _SEARCH_CRITERIA} if _VERBOSE_RESPONSE else {})
                 }
             )
         
@@ -103,15 +121,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         ]
         
         # Log instance details
-        for instance in matching_instances:
-            scheduled_time = instance.tags.get('StopWeekEnd', 'N/A')
-            logger.info(
-                f"Instance {instance.instance_id}: "
-                f"scheduled={scheduled_time}, state={instance.state}, "
-                f"type={instance.instance_type}, az={instance.availability_zone}"
-            )
+        if logger.isEnabledFor(logging.DEBUG):
+            for instance in matching_instances:
+                logger.debug(
+                    "Instance %s: scheduled=%s, state=%s, type=%s, az=%s",
+                    instance.instance_id, instance.tags.get('StopWeekEnd', 'N/A'), instance.state,
+                    instance.instance_type, instance.availability_zone
+                )
         
-        logger.info(f"Instances in running state: {len(running_instances)}")
+        logger.info("Instances in running state: %s", len(running_instances))
         
         if not running_instances:
             logger.info("No instances in running state found")
@@ -121,34 +139,40 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 action='stop_weekend',
                 additional_info={
                     'message': 'No instances in running state found',
-                    'instances_with_schedule': len(matching_instances),
-                    'instances_in_running_state': 0,
-                    'current_time': current_time.isoformat(),
-                    'timezone': timezone
+                    **({
+                        'instances_with_schedule': len(matching_instances),
+                        'instances_in_running_state': 0,
+                        'current_time': current_time_iso,
+                        'timezone': timezone
+                    } if _VERBOSE_RESPONSE else {})
                 }
             )
         
         # Stop the running instances
-        logger.info(f"Attempting to stop {len(running_instances)} instances")
-        results = ec2_manager.stop_instances(running_instances)
+        logger.info("Attempting to stop %s instances", len(running_instances))
+        results = _EC2_MANAGER.stop_instances(running_instances)
         
         # Log results summary
-        successful_stops = [r for r in results if r.success]
-        failed_stops = [r for r in results if not r.success]
+        successful_stops, failed_stops = [], []
+        add_success, add_failure = successful_stops.append, failed_stops.append
+        for result in results:
+            (add_success if result.success else add_failure)(result)
         
-        logger.info(f"Stop operation completed: {len(successful_stops)} successful, {len(failed_stops)} failed")
+        logger.info("Stop operation completed: %s successful, %s failed", len(successful_stops), len(failed_stops))
         
         # Log successful stops
-        for result in successful_stops:
-            instance = next(i for i in running_instances if i.instance_id == result.instance_id)
-            scheduled_time = instance.tags.get('StopWeekEnd', 'N/A')
-            logger.info(f"Successfully stopped instance: {result.instance_id} (scheduled: {scheduled_time})")
+        if logger.isEnabledFor(logging.DEBUG):
+            instances_by_id = {i.instance_id: i for i in running_instances}
+            for result in successful_stops:
+                instance = instances_by_id[result.instance_id]
+                scheduled_time = instance.tags.get('StopWeekEnd', 'N/A')
+                logger.debug("Successfully stopped instance: %s (scheduled: %s)", result.instance_id, scheduled_time)
         
         # Log failed stops with details
         for result in failed_stops:
             logger.error(
-                f"Failed to stop instance {result.instance_id}: "
-                f"{result.message} (Error code: {result.error_code})"
+                "Failed to stop instance %s: %s (Error code: %s)",
+                result.instance_id, result.message, result.error_code
             )
         
         # Determine response status code
@@ -163,24 +187,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             action='stop_weekend',
             additional_info={
                 'function_name': 'EC2StopWeekEnd',
-                'current_time': current_time.isoformat(),
+                'current_time': current_time_iso,
                 'timezone': timezone,
                 'weekday': weekday,
                 'instances_with_schedule': len(matching_instances),
                 'instances_in_running_state': len(running_instances),
-                'search_criteria': {
-                    'tag_name': 'StopWeekEnd',
-                    'time_window_minutes': 5,
-                    'weekday_filter': [6, 7]
-                }
-            }
+                'search_criteria': _SEARCH_CRITERIA
+            } if _VERBOSE_RESPONSE else None
         )
         
-        logger.info(f"Function completed successfully. Response status: {status_code}")
+        logger.info("Function completed successfully. Response status: %s", status_code)
         return response
         
     except Exception as e:
-        logger.error(f"Unexpected error in EC2StopWeekEnd: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in EC2StopWeekEnd: %s", e, exc_info=True)
         
         # Create error response
         error_response = create_lambda_response(
@@ -0,0 +1,36 @@
+"""
+Shared configuration helpers for the EC2 Auto Start/Stop layer modules
+
+Used by both ec2_utils and ec2_utils_improved so environment settings are parsed
+the same way by the original and the improved Lambda functions.
+"""
+
+import logging
+import os
+
+# Concurrent start/stop calls used when SCHED_THREADS is unset or invalid
+DEFAULT_SCHED_THREADS = 8
+
+
+def get_sched_threads(max_threads: int) -> int:
+    """
+    Read the SCHED_THREADS environment variable as a thread count
+
+    A non-integer value falls back to DEFAULT_SCHED_THREADS with a warning rather than
+    failing Lambda init, and the result is clamped to [1, max_threads].
+
+    Args:
+        max_threads: Upper bound, normally the EC2 client's max_pool_connections
+
+    Returns:
+        Number of threads to use for concurrent StartInstances/StopInstances calls
+    """
+    value = os.environ.get('SCHED_THREADS', '')
+    try:
+        threads = int(value) if value.strip() else DEFAULT_SCHED_THREADS
+    except ValueError:
+        logging.getLogger().warning(
+            "Invalid SCHED_THREADS value %r, using %s", value, DEFAULT_SCHED_THREADS
+        )
+        threads = DEFAULT_SCHED_THREADS
+    return max(1, min(threads, max_threads))
@@ -1,38 +1,122 @@
-import boto3
+import botocore.session
 import logging
 import os
 import time
 import datetime
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from ec2_config import get_sched_threads
+
+# Keep-alive lets pooled connections survive the Lambda freeze between warm invocations
+_EC2_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10,
+    max_pool_connections=50
+)
+
+# DescribeInstances page size (API maximum) and Start/StopInstances batch size
+DESCRIBE_PAGE_SIZE = 1000
+INSTANCE_BATCH_SIZE = 200
+
+# Concurrent per-instance calls when a failed batch is retried one by one, tunable via
+# SCHED_THREADS and clamped to [1, the client's connection pool size]
+MAX_CONCURRENT_CALLS = get_sched_threads(_EC2_CLIENT_CONFIG.max_pool_connections)
+
+# Time-tag schedules (instance ID -> tag value) fetched per tag name, reused by warm invocations for
+# DESCRIBE_CACHE_TTL seconds (0 disables); instance states are never cached
+DESCRIBE_CACHE_TTL = int(os.environ.get('DESCRIBE_CACHE_TTL', '60'))
+_DESCRIBE_CACHE = {}
+
+# Handler installed by configure_logging(), kept so repeat calls are a no-op
+_LOG_HANDLER = None
 
 def configure_logging():
-    """Configures logging for the Lambda function."""
+    """Configures logging for the Lambda function; repeat calls return the already-configured logger."""
+    global _LOG_HANDLER
     logger = logging.getLogger()
-    for handler in logger.handlers:
+    if _LOG_HANDLER is not None and _LOG_HANDLER in logger.handlers:
+        return logger
+    for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     handler = logging.StreamHandler()
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
     logger.addHandler(handler)
     logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    _LOG_HANDLER = handler
     return logger
 
+# Shared EC2 client, created on first use and reused for the life of the execution environment
+_EC2_CLIENT = None
+
+# Timezone last applied with TZ + tzset by set_region_timezone()
+_APPLIED_TZ = None
+
 def get_ec2_client():
-    """Returns a boto3 EC2 client."""
-    return boto3.client('ec2')
+    """Returns the shared EC2 client, creating it on first use."""
+    global _EC2_CLIENT
+    if _EC2_CLIENT is None:
+        # botocore directly: only the low-level client is used, so boto3's session/resource layer isn't needed
+        _EC2_CLIENT = botocore.session.get_session().create_client('ec2', config=_EC2_CLIENT_CONFIG)
+    return _EC2_CLIENT
 
-def get_instances_by_tag(ec2_client, tag_name, tag_values, instance_states):
+def warm_ec2_connection(ec2_client):
+    """Issues a cheap DescribeInstances call so endpoint resolution and TLS setup happen during init."""
+    try:
+        ec2_client.describe_instances(
+            MaxResults=5,
+            Filters=[{'Name': 'instance-state-name', 'Values': ['pending']}]
+        )
+    except Exception as e:
+        logging.debug("EC2 connection warm-up failed: %s", e)
+
+def get_event_instance_ids(event):
+    """Returns the instance IDs carried by an invocation event, or an empty list for scheduled events."""
+    event = event or {}
+    instance_ids = event.get('instance_ids') or (event.get('detail') or {}).get('instance-id')
+    if not instance_ids:
+        return []
+    if isinstance(instance_ids, str):
+        return [instance_ids]
+    return list(instance_ids)
+
+def _iter_instances_with_tags(ec2_client, **describe_kwargs):
+    """Yields (instance, tag dict) pairs from DescribeInstances, following NextToken directly."""
+    # A plain NextToken loop avoids the per-page overhead of botocore's paginator
+    while True:
+        page = ec2_client.describe_instances(**describe_kwargs)
+        # Flatten reservations -> instances in C rather than with a nested Python loop
+        for instance in itertools.chain.from_iterable(r['Instances'] for r in page['Reservations']):
+            yield instance, {tag['Key']: tag['Value'] for tag in instance.get('Tags', ())}
+        next_token = page.get('NextToken')
+        if not next_token:
+            return
+        describe_kwargs['NextToken'] = next_token
+
+def iter_instances_by_tag(ec2_client, tag_name, tag_values, instance_states, instance_ids=None):
     """
-    Retrieves EC2 instances based on tags and instance states.
+    Yields EC2 instance IDs based on tags and instance states as result pages arrive.
 
     Args:
         ec2_client: The boto3 EC2 client.
         tag_name: The name of the tag to filter by (e.g., 'AutoStart').
         tag_values: A list of tag values to match (e.g., ['TRUE', 'True', 'true']).
         instance_states: A list of instance states to filter by (e.g., ['stopped']).
+        instance_ids: Optional instance IDs to look up directly instead of scanning the fleet.
 
-    Returns:
-        A list of instance IDs.
+    Yields:
+        Instance IDs.
     """
+    if not tag_values or not instance_states:
+        # No value or state can match, so skip the DescribeInstances call
+        return
     filters = [
         {
             'Name': f'tag:{tag_name}',
@@ -44,16 +128,43 @@ def get_instances_by_tag(ec2_client, tag_name, tag_values, instance_states):
         }
     ]
     try:
-        response = ec2_client.describe_instances(Filters=filters)
-        instance_ids = []
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instance_ids.append(instance['InstanceId'])
-        return instance_ids
+        if instance_ids:
+            # MaxResults cannot be combined with InstanceIds
+            instances = _iter_instances_with_tags(ec2_client, InstanceIds=list(instance_ids), Filters=filters)
+        else:
+            instances = _iter_instances_with_tags(
+                ec2_client, Filters=filters, MaxResults=DESCRIBE_PAGE_SIZE
+            )
+        for instance, _ in instances:
+            yield instance['InstanceId']
     except Exception as e:
-        logging.error(f"Error describing instances: {e}")
+        logging.error("Error describing instances: %s", e)
         raise
 
+def get_instances_by_tag(ec2_client, tag_name, tag_values, instance_states):
+    """
+    Retrieves EC2 instances based on tags and instance states.
+
+    Args:
+        ec2_client: The boto3 EC2 client.
+        tag_name: The name of the tag to filter by (e.g., 'AutoStart').
+        tag_values: A list of tag values to match (e.g., ['TRUE', 'True', 'true']).
+        instance_states: A list of instance states to filter by (e.g., ['stopped']).
+
+    Returns:
+        A list of instance IDs.
+    """
+    return list(iter_instances_by_tag(ec2_client, tag_name, tag_values, instance_states))
+
+def batch_instance_ids(instance_ids, batch_size=INSTANCE_BATCH_SIZE):
+    """Groups an iterable of instance IDs into lists of at most batch_size IDs."""
+    iterator = iter(instance_ids)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
 def start_ec2_instances(ec2_client, instance_ids):
     """Starts a list of EC2 instances."""
     if not instance_ids:
@@ -61,10 +172,10 @@ def start_ec2_instances(ec2_client, instance_ids):
         return
     try:
         response = ec2_client.start_instances(InstanceIds=instance_ids)
-        logging.info(f"Successfully initiated start for instances: {instance_ids}")
+        logging.info("Successfully initiated start for instances: %s", instance_ids)
         return response
     except Exception as e:
-        logging.error(f"Error starting instances {instance_ids}: {e}")
+        logging.error("Error starting instances %s: %s", instance_ids, e)
         raise
 
 def stop_ec2_instances(ec2_client, instance_ids):
@@ -74,40 +185,120 @@ def stop_ec2_instances(ec2_client, instance_ids):
         return
     try:
         response = ec2_client.stop_instances(InstanceIds=instance_ids)
-        logging.info(f"Successfully initiated stop for instances: {instance_ids}")
+        logging.info("Successfully initiated stop for instances: %s", instance_ids)
         return response
     except Exception as e:
-        logging.error(f"Error stopping instances {instance_ids}: {e}")
+        logging.error("Error stopping instances %s: %s", instance_ids, e)
         raise
 
-def set_region_timezone():
-    """Sets the timezone based on REGION_TZ environment variable."""
+def get_region_timezone():
+    """Resolves the timezone name from REGION_TZ (falling back to TZ, then UTC) without changing process state."""
     logger = logging.getLogger()
     
-    time_now = datetime.datetime.now()
-    logger.info(f"Current time before timezone setting: {time_now}")
+    timezone = os.environ.get('REGION_TZ')
+    if timezone:
+        logger.info("Using REGION_TZ environment variable: %s", timezone)
+    else:
+        timezone = os.environ.get('TZ') or 'UTC'
+        logger.info("REGION_TZ not available, using TZ or defaulting to UTC: %s", timezone)
     
+    return timezone
+
+def set_region_timezone():
+    """Sets the process timezone (TZ + tzset) from REGION_TZ; prefer get_region_timezone() with get_timezone_info()."""
+    global _APPLIED_TZ
+    timezone = str(get_region_timezone())
+    # Warm invocations usually apply the same timezone again; skip the tzset then
+    if timezone == _APPLIED_TZ and os.environ.get('TZ') == timezone:
+        return timezone
+    os.environ['TZ'] = timezone
+    time.tzset()
+    _APPLIED_TZ = timezone
+    logging.getLogger().info("Process timezone set to: %s", timezone)
+    return timezone
+
+def get_timezone_info(timezone):
+    """Returns a ZoneInfo for the given timezone name, falling back to UTC if it is unknown."""
     try:
-        timezone_var = os.environ.get('REGION_TZ')
-        if timezone_var:
-            logger.info(f"Using REGION_TZ environment variable: {timezone_var}")
-        else:
-            timezone_var = os.environ.get('TZ', 'UTC')
-            logger.info(f"REGION_TZ not available, using TZ or defaulting to UTC: {timezone_var}")
-    except Exception as e:
-        logger.warning(f"Error getting timezone environment variable: {e}")
-        timezone_var = 'UTC'
-    
-    timezone = timezone_var if timezone_var else 'UTC'
-    logger.info(f"Setting timezone to: {timezone}")
+        return ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        logging.warning("Unknown timezone '%s', using UTC", timezone)
+        return ZoneInfo('UTC')
+
+def describe_time_tag_schedule(ec2_client, tag_name):
+    """
+    Returns (schedule, states) for running/stopped instances carrying tag_name.
+
+    schedule maps instance ID to the tag value and is cached per tag name for DESCRIBE_CACHE_TTL
+    seconds, so back-to-back warm invocations skip the fleet scan. states maps instance ID to its
+    state and is only returned by a fresh scan; on a cache hit it is None and callers must read
+    live states with get_instance_states() before acting on any instance.
+    """
+    cached = _DESCRIBE_CACHE.get(tag_name)
+    if cached and time.monotonic() - cached[0] < DESCRIBE_CACHE_TTL:
+        return cached[1], None
     
-    os.environ['TZ'] = str(timezone)
-    time.tzset()
+    # Only running/stopped instances carrying the schedule tag are relevant; the time match stays local
+    filters = [
+        {
+            'Name': 'tag-key',
+            'Values': [tag_name]
+        },
+        {
+            'Name': 'instance-state-name',
+            'Values': ['running', 'stopped']
+        }
+    ]
     
-    time_after = datetime.datetime.now()
-    logger.info(f"Current time after timezone setting: {time_after}")
+    instances = _iter_instances_with_tags(
+        ec2_client, Filters=filters, MaxResults=DESCRIBE_PAGE_SIZE
+    )
+    schedule = {}
+    states = {}
+    for instance, tags in instances:
+        scheduled_time = tags.get(tag_name)
+        if scheduled_time is not None:
+            schedule[instance['InstanceId']] = scheduled_time
+            states[instance['InstanceId']] = instance['State']['Name']
     
-    return timezone
+    if DESCRIBE_CACHE_TTL > 0:
+        _DESCRIBE_CACHE[tag_name] = (time.monotonic(), schedule)
+    return schedule, states
+
+def get_instance_states(ec2_client, instance_ids):
+    """Returns {instance_id: state} read live from DescribeInstances for the given instance IDs."""
+    return {
+        instance['InstanceId']: instance['State']['Name']
+        for instance, _ in _iter_instances_with_tags(ec2_client, InstanceIds=list(instance_ids))
+    }
+
+def _minutes_of_day(time_str):
+    """Parses an 'HH:MM' tag value into minutes since midnight, or None if it is malformed."""
+    try:
+        hours, minutes = map(int, time_str.split(':'))
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+def _in_time_window(scheduled, window_start, window_end):
+    """Checks a minutes-of-day value against a window that may wrap past midnight."""
+    if window_start <= window_end:
+        return window_start <= scheduled <= window_end
+    return scheduled >= window_start or scheduled <= window_end
+
+def _due_instances(schedule, window_start, window_end):
+    """Returns (instance_id, scheduled_time) pairs whose tag value falls inside the window."""
+    due = []
+    for instance_id, scheduled_time in schedule.items():
+        scheduled_minutes = _minutes_of_day(scheduled_time)
+        if scheduled_minutes is None:
+            logging.warning("Invalid time format '%s' for instance %s", scheduled_time, instance_id)
+            continue
+        if _in_time_window(scheduled_minutes, window_start, window_end):
+            due.append((instance_id, scheduled_time))
+    return due
 
 def get_instances_by_time_tag(ec2_client, tag_name, current_time, time_window_minutes=5, weekday_filter=None):
     """
@@ -125,50 +316,68 @@ def get_instances_by_time_tag(ec2_client, tag_name, current_time, time_window_mi
     """
     logger = logging.getLogger()
     
+    # Nothing can match on an excluded day, so skip the DescribeInstances calls entirely
+    current_weekday = current_time.isoweekday()  # Monday is 1, Sunday is 7
+    if weekday_filter and not (weekday_filter[0] <= current_weekday <= weekday_filter[1]):
+        logger.info("Weekday %s outside %s, skipping %s lookup", current_weekday, weekday_filter, tag_name)
+        return []
+    
     try:
-        response = ec2_client.describe_instances()
-        matching_instances = []
+        schedule, states = describe_time_tag_schedule(ec2_client, tag_name)
         
-        time_plus = current_time + datetime.timedelta(minutes=time_window_minutes)
-        time_minus = current_time - datetime.timedelta(minutes=time_window_minutes)
-        current_time_str = current_time.strftime('%H:%M')
-        max_time_str = time_plus.strftime('%H:%M')
-        min_time_str = time_minus.strftime('%H:%M')
-        current_weekday = current_time.isoweekday()  # Monday is 1, Sunday is 7
+        # Compare integer minutes of day so windows crossing midnight (e.g. 23:58 - 00:08) match
+        current_minutes = current_time.hour * 60 + current_time.minute
+        window_start = (current_minutes - time_window_minutes) % 1440
+        window_end = (current_minutes + time_window_minutes) % 1440
         
-        logger.info(f"Current time: {current_time_str}, Time window: {min_time_str} - {max_time_str}, Weekday: {current_weekday}")
+        logger.info(
+            "Current time: %02d:%02d, Time window: %02d:%02d - %02d:%02d, Weekday: %s",
+            *divmod(current_minutes, 60), *divmod(window_start, 60), *divmod(window_end, 60), current_weekday
+        )
         
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == tag_name:
-                            scheduled_time = tag['Value']
-                            
-                            # Check if time matches within window
-                            time_matches = min_time_str <= scheduled_time <= max_time_str
-                            
-                            # Check weekday filter if provided
-                            weekday_matches = True
-                            if weekday_filter:
-                                min_day, max_day = weekday_filter
-                                weekday_matches = min_day <= current_weekday <= max_day
-                            
-                            if time_matches and weekday_matches:
-                                matching_instances.append({
-                                    'instance_id': instance['InstanceId'],
-                                    'scheduled_time': scheduled_time,
-                                    'current_state': instance['State']['Name']
-                                })
-                                logger.info(f"Found matching instance {instance['InstanceId']} with scheduled time {scheduled_time}")
-                            break
+        due = _due_instances(schedule, window_start, window_end)
+        if due and states is None:
+            # The schedule came from the cache; read current states so a stale state is never acted on
+            try:
+                states = get_instance_states(ec2_client, [instance_id for instance_id, _ in due])
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'InvalidInstanceID.NotFound':
+                    raise
+                # A cached instance has been terminated since; rescan the fleet instead
+                _DESCRIBE_CACHE.pop(tag_name, None)
+                schedule, states = describe_time_tag_schedule(ec2_client, tag_name)
+                due = _due_instances(schedule, window_start, window_end)
+        
+        matching_instances = []
+        for instance_id, scheduled_time in due:
+            state = states.get(instance_id)
+            if state is None:
+                logger.debug("Instance %s no longer found, skipping", instance_id)
+                continue
+            matching_instances.append({
+                'instance_id': instance_id,
+                'scheduled_time': scheduled_time,
+                'current_state': state
+            })
+            logger.debug("Found matching instance %s with scheduled time %s", instance_id, scheduled_time)
         
         return matching_instances
         
     except Exception as e:
-        logger.error(f"Error getting instances by time tag: {e}")
+        logger.error("Error getting instances by time tag: %s", e)
         raise
 
+def _change_single_state(change_state, action, done, instance_id, scheduled_time):
+    """Start or stop a single instance after its batch call failed; returns whether it succeeded"""
+    logger = logging.getLogger()
+    try:
+        change_state(InstanceIds=[instance_id])
+        logger.debug("%s instance %s scheduled for %s", done, instance_id, scheduled_time)
+        return True
+    except Exception as e:
+        logger.error("Error %sing instance %s: %s", action, instance_id, e)
+        return False
+
 def process_time_based_instances(ec2_client, instances_data, target_state, action):
     """
     Processes instances based on time scheduling.
@@ -182,26 +391,36 @@ def process_time_based_instances(ec2_client, instances_data, target_state, actio
     Returns:
         Number of instances processed.
     """
+    if not instances_data:
+        return 0
     logger = logging.getLogger()
     processed_count = 0
+    if action == 'start':
+        change_state, done = ec2_client.start_instances, 'Started'
+    else:
+        change_state, done = ec2_client.stop_instances, 'Stopped'
     
+    scheduled_times = {}
     for instance_data in instances_data:
         instance_id = instance_data['instance_id']
         current_state = instance_data['current_state']
-        scheduled_time = instance_data['scheduled_time']
         
         if current_state == target_state:
-            try:
-                if action == 'start':
-                    ec2_client.start_instances(InstanceIds=[instance_id])
-                    logger.info(f"Started instance {instance_id} scheduled for {scheduled_time}")
-                elif action == 'stop':
-                    ec2_client.stop_instances(InstanceIds=[instance_id])
-                    logger.info(f"Stopped instance {instance_id} scheduled for {scheduled_time}")
-                processed_count += 1
-            except Exception as e:
-                logger.error(f"Error {action}ing instance {instance_id}: {e}")
+            scheduled_times[instance_id] = instance_data['scheduled_time']
         else:
-            logger.info(f"Instance {instance_id} not in {target_state} state (current: {current_state})")
+            logger.debug("Instance %s not in %s state (current: %s)", instance_id, target_state, current_state)
+    
+    # One StartInstances/StopInstances call per batch instead of one per instance
+    for batch in batch_instance_ids(scheduled_times):
+        try:
+            change_state(InstanceIds=batch)
+            logger.info("%s instances %s on schedule", done, batch)
+            processed_count += len(batch)
+        except Exception as e:
+            logger.error("Error %sing instances %s, retrying individually: %s", action, batch, e)
+            # A single bad instance fails the whole call, so retry one by one (concurrently) to isolate it
+            change_single_state = functools.partial(_change_single_state, change_state, action, done)
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_CALLS, len(batch))) as executor:
+                processed_count += sum(executor.map(change_single_state, batch, map(scheduled_times.get, batch)))
     
     return processed_count
@@ -15,12 +15,53 @@ import os
 import time
 import datetime
 import json
-from typing import Dict, List, Optional, Tuple, Union, Any
-from dataclasses import dataclass, asdict
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
+from dataclasses import dataclass, replace
 from enum import Enum
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 import re
 
+from ec2_config import get_sched_threads
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder when the layer lacks orjson
+    orjson = None
+
+# Keep-alive lets pooled connections survive the Lambda freeze between warm invocations
+_EC2_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10,
+    max_pool_connections=50
+)
+
+# EC2 clients shared by every EC2Manager in the execution environment, keyed by region
+_CLIENT_CACHE: Dict[str, Any] = {}
+
+# DescribeInstances page size for fleet scans (the API maximum); bounds memory to one page
+DESCRIBE_PAGE_SIZE = 1000
+
+# Maximum number of instance IDs sent in a single StartInstances/StopInstances call
+MAX_INSTANCES_PER_CALL = 200
+# Widest time window (in minutes) enumerated into a server-side tag value filter
+MAX_TIME_TAG_FILTER_MINUTES = 61
+
+# Zero-padded HH:MM schedule tag values, compiled once rather than on every validation call
+_TIME_RE = re.compile(r'^([01][0-9]|2[0-3]):[0-5][0-9]$')
+
+# Maximum number of concurrent StartInstances/StopInstances calls (batches or per-instance retries), tunable via
+# SCHED_THREADS and clamped to [1, max_pool_connections]
+MAX_CONCURRENT_BATCHES = get_sched_threads(_EC2_CLIENT_CONFIG.max_pool_connections)
+# Per-instance fallback threads for each concurrently running batch, so batches x fallback threads
+# stays within the connection pool when several batches fail at once
+FALLBACK_THREADS_PER_BATCH = max(1, _EC2_CLIENT_CONFIG.max_pool_connections // MAX_CONCURRENT_BATCHES)
+
 
 class InstanceState(Enum):
     """EC2 Instance states"""
@@ -38,7 +79,7 @@ class ActionType(Enum):
     STOP = "stop"
 
 
-@dataclass
+@dataclass(slots=True)
 class EC2Resource:
     """Represents an EC2 instance with relevant metadata"""
     instance_id: str
@@ -51,7 +92,7 @@ class EC2Resource:
     public_ip: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationResult:
     """Result of an EC2 operation"""
     success: bool
@@ -63,7 +104,26 @@ class OperationResult:
 
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.datetime.utcnow()
+            self.timestamp = datetime.datetime.now(datetime.timezone.utc)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat JSON-ready dict; much cheaper than dataclasses.asdict, which deep-copies every field"""
+        return {
+            'success': self.success,
+            'instance_id': self.instance_id,
+            'action': self.action,
+            'message': self.message,
+            'error_code': self.error_code,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
+
+
+def _get_ec2_client(region: str) -> Any:
+    """Return the cached EC2 client for a region, creating it on first use"""
+    client = _CLIENT_CACHE.get(region)
+    if client is None:
+        client = _CLIENT_CACHE[region] = boto3.client('ec2', region_name=region, config=_EC2_CLIENT_CONFIG)
+    return client
 
 
 class EC2Manager:
@@ -80,19 +140,31 @@ class EC2Manager:
         self.logger = self._setup_logger()
         
         try:
-            self.ec2_client = boto3.client('ec2', region_name=self.region)
-            self.ec2_resource = boto3.resource('ec2', region_name=self.region)
+            self.ec2_client = _get_ec2_client(self.region)
         except Exception as e:
-            self.logger.error(f"Failed to initialize EC2 clients: {e}")
+            self.logger.error("Failed to initialize EC2 client: %s", e)
             raise
     
+    def warm_connection(self) -> None:
+        """
+        Issue a cheap DescribeInstances call so endpoint resolution and the TLS
+        handshake happen during Lambda init rather than on the first invocation
+        """
+        try:
+            self.ec2_client.describe_instances(
+                MaxResults=5,
+                Filters=[{'Name': 'instance-state-name', 'Values': ['pending']}]
+            )
+        except Exception as e:
+            self.logger.debug("EC2 connection warm-up failed: %s", e)
+    
     def _setup_logger(self) -> logging.Logger:
         """Setup structured logging"""
         logger = logging.getLogger(f"EC2Manager-{self.region}")
         
-        # Remove existing handlers to avoid duplicates
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        # Loggers are process-wide; reuse the one configured by an earlier manager for this region
+        if logger.handlers:
+            return logger
         
         # Create handler with structured format
         handler = logging.StreamHandler()
@@ -102,6 +174,8 @@ class EC2Manager:
         handler.setFormatter(formatter)
         logger.addHandler(handler)
         logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+        # The manager logger has its own handler; don't also emit every record via the root handler
+        logger.propagate = False
         
         return logger
     
@@ -109,7 +183,8 @@ class EC2Manager:
         self, 
         tag_name: str, 
         tag_values: List[str], 
-        instance_states: Optional[List[str]] = None
+        instance_states: Optional[List[str]] = None,
+        instance_ids: Optional[List[str]] = None
     ) -> List[EC2Resource]:
         """
         Get EC2 instances by tag with enhanced filtering and error handling
@@ -118,10 +193,37 @@ class EC2Manager:
             tag_name: Tag key to filter by
             tag_values: List of tag values to match
             instance_states: Optional list of instance states to filter by
+            instance_ids: Optional instance IDs to look up directly instead of scanning the fleet
             
         Returns:
             List of EC2Resource objects
         """
+        instances = list(self.iter_instances_by_tag(tag_name, tag_values, instance_states, instance_ids))
+        self.logger.info("Found %s instances matching criteria", len(instances))
+        return instances
+    
+    def iter_instances_by_tag(
+        self,
+        tag_name: str,
+        tag_values: List[str],
+        instance_states: Optional[List[str]] = None,
+        instance_ids: Optional[List[str]] = None
+    ) -> Iterator[EC2Resource]:
+        """
+        Yield EC2 instances by tag as DescribeInstances pages arrive
+        
+        Passing the generator straight to start_instances/stop_instances lets the
+        first batches be issued while later pages are still being fetched.
+        
+        Args:
+            tag_name: Tag key to filter by
+            tag_values: List of tag values to match
+            instance_states: Optional list of instance states to filter by
+            instance_ids: Optional instance IDs to look up directly instead of scanning the fleet
+            
+        Yields:
+            EC2Resource objects
+        """
         try:
             filters = [
                 {
@@ -136,25 +238,24 @@ class EC2Manager:
                     'Values': instance_states
                 })
             
-            self.logger.info(f"Querying instances with tag {tag_name} in values {tag_values}")
-            
-            paginator = self.ec2_client.get_paginator('describe_instances')
-            instances = []
+            self.logger.info("Querying instances with tag %s in values %s", tag_name, tag_values)
             
-            for page in paginator.paginate(Filters=filters):
-                for reservation in page['Reservations']:
-                    for instance in reservation['Instances']:
-                        instances.append(self._create_ec2_resource(instance))
+            describe_kwargs = {'Filters': filters}
+            if instance_ids:
+                describe_kwargs['InstanceIds'] = list(instance_ids)
+            else:
+                # MaxResults cannot be combined with InstanceIds, so only fleet scans set a page size
+                describe_kwargs['MaxResults'] = DESCRIBE_PAGE_SIZE
             
-            self.logger.info(f"Found {len(instances)} instances matching criteria")
-            return instances
+            for instance, tags in self._iter_instances_with_tags(**describe_kwargs):
+                yield self._create_ec2_resource(instance, tags)
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
-            self.logger.error(f"AWS API error getting instances by tag: {error_code} - {e}")
+            self.logger.error("AWS API error getting instances by tag: %s - %s", error_code, e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error getting instances by tag: {e}")
+            self.logger.error("Unexpected error getting instances by tag: %s", e)
             raise
     
     def get_instances_by_time_tag(
@@ -176,111 +277,266 @@ class EC2Manager:
         Returns:
             List of matching EC2Resource objects
         """
+        # Nothing can match on an excluded day, so skip the DescribeInstances calls entirely
+        current_weekday = current_time.isoweekday()
+        if weekday_filter and not (weekday_filter[0] <= current_weekday <= weekday_filter[1]):
+            self.logger.info("Weekday %s outside %s, skipping %s lookup", current_weekday, weekday_filter, tag_name)
+            return []
+        
         try:
-            self.logger.info(f"Searching for instances with time tag {tag_name}")
+            self.logger.info("Searching for instances with time tag %s", tag_name)
             
-            # Get all instances (we'll filter by time locally)
-            paginator = self.ec2_client.get_paginator('describe_instances')
             matching_instances = []
             
-            # Calculate time window
-            time_plus = current_time + datetime.timedelta(minutes=time_window_minutes)
-            time_minus = current_time - datetime.timedelta(minutes=time_window_minutes)
-            current_time_str = current_time.strftime('%H:%M')
-            max_time_str = time_plus.strftime('%H:%M')
-            min_time_str = time_minus.strftime('%H:%M')
-            current_weekday = current_time.isoweekday()
+            # Calculate time window as integer minutes of day so windows crossing midnight
+            # (e.g. 23:58 - 00:08) match; no per-call timedelta arithmetic or strftime
+            current_minutes = current_time.hour * 60 + current_time.minute
+            window_start = (current_minutes - time_window_minutes) % 1440
+            window_end = (current_minutes + time_window_minutes) % 1440
             
             self.logger.info(
-                f"Time window: {min_time_str} - {max_time_str}, "
-                f"Current weekday: {current_weekday}"
+                "Time window: %02d:%02d - %02d:%02d, Current weekday: %s",
+                *divmod(window_start, 60), *divmod(window_end, 60), current_weekday
+            )
+            
+            # Only fetch running/stopped instances whose tag value falls inside the window;
+            # the local check below still validates the format and the window
+            filters = [
+                self._time_tag_filter(tag_name, current_minutes, time_window_minutes),
+                {
+                    'Name': 'instance-state-name',
+                    'Values': [InstanceState.RUNNING.value, InstanceState.STOPPED.value]
+                }
+            ]
+            
+            instances_with_tags = self._iter_instances_with_tags(
+                Filters=filters, MaxResults=DESCRIBE_PAGE_SIZE
             )
+            for instance, tags in instances_with_tags:
+                scheduled_time = tags.get(tag_name)
+                if scheduled_time is None:
+                    continue
+                
+                # Validate and parse the time in one step
+                scheduled_minutes = self._parse_time_minutes(scheduled_time)
+                if scheduled_minutes is None:
+                    self.logger.warning(
+                        "Invalid time format '%s' for instance %s",
+                        scheduled_time, instance['InstanceId']
+                    )
+                    continue
+                
+                # Check if time matches within window
+                if window_start <= window_end:
+                    time_matches = window_start <= scheduled_minutes <= window_end
+                else:
+                    time_matches = scheduled_minutes >= window_start or scheduled_minutes <= window_end
+                
+                if time_matches:
+                    ec2_resource = self._create_ec2_resource(instance, tags)
+                    matching_instances.append(ec2_resource)
+                    self.logger.debug(
+                        "Found matching instance %s with scheduled time %s",
+                        instance['InstanceId'], scheduled_time
+                    )
             
-            for page in paginator.paginate():
-                for reservation in page['Reservations']:
-                    for instance in reservation['Instances']:
-                        if 'Tags' in instance:
-                            for tag in instance['Tags']:
-                                if tag['Key'] == tag_name:
-                                    scheduled_time = tag['Value']
-                                    
-                                    # Validate time format
-                                    if not self._validate_time_format(scheduled_time):
-                                        self.logger.warning(
-                                            f"Invalid time format '{scheduled_time}' for instance "
-                                            f"{instance['InstanceId']}"
-                                        )
-                                        continue
-                                    
-                                    # Check if time matches within window
-                                    time_matches = min_time_str <= scheduled_time <= max_time_str
-                                    
-                                    # Check weekday filter if provided
-                                    weekday_matches = True
-                                    if weekday_filter:
-                                        min_day, max_day = weekday_filter
-                                        weekday_matches = min_day <= current_weekday <= max_day
-                                    
-                                    if time_matches and weekday_matches:
-                                        ec2_resource = self._create_ec2_resource(instance)
-                                        matching_instances.append(ec2_resource)
-                                        self.logger.info(
-                                            f"Found matching instance {instance['InstanceId']} "
-                                            f"with scheduled time {scheduled_time}"
-                                        )
-                                    break
-            
-            self.logger.info(f"Found {len(matching_instances)} instances with matching schedule")
+            self.logger.info("Found %s instances with matching schedule", len(matching_instances))
             return matching_instances
             
         except Exception as e:
-            self.logger.error(f"Error getting instances by time tag: {e}")
+            self.logger.error("Error getting instances by time tag: %s", e)
             raise
     
-    def start_instances(self, instances: List[EC2Resource]) -> List[OperationResult]:
+    def get_states(self, instance_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the current state of instances via DescribeInstanceStatus
+        
+        The status payload carries no tags, network interfaces or block devices,
+        so it is much smaller than DescribeInstances when only the state is needed.
+        
+        Args:
+            instance_ids: Instance IDs to look up
+            
+        Returns:
+            Mapping of instance ID to state name
+        """
+        paginator = self.ec2_client.get_paginator('describe_instance_status')
+        states = {}
+        for page in paginator.paginate(InstanceIds=instance_ids, IncludeAllInstances=True):
+            for status in page['InstanceStatuses']:
+                states[status['InstanceId']] = status['InstanceState']['Name']
+        return states
+    
+    def start_instances(self, instances: Iterable[EC2Resource]) -> List[OperationResult]:
         """
         Start EC2 instances with comprehensive error handling
         
         Args:
-            instances: List of EC2Resource objects to start
+            instances: EC2Resource objects to start (any iterable, e.g. iter_instances_by_tag())
             
         Returns:
             List of OperationResult objects
         """
-        results = []
-        
-        for instance in instances:
-            result = self._start_single_instance(instance)
-            results.append(result)
-        
-        # Log summary
-        successful = sum(1 for r in results if r.success)
-        self.logger.info(f"Start operation completed: {successful}/{len(results)} successful")
-        
-        return results
+        return self._change_instance_states(instances, ActionType.START)
     
-    def stop_instances(self, instances: List[EC2Resource]) -> List[OperationResult]:
+    def stop_instances(self, instances: Iterable[EC2Resource]) -> List[OperationResult]:
         """
         Stop EC2 instances with comprehensive error handling
         
         Args:
-            instances: List of EC2Resource objects to stop
+            instances: EC2Resource objects to stop (any iterable, e.g. iter_instances_by_tag())
             
         Returns:
             List of OperationResult objects
         """
+        return self._change_instance_states(instances, ActionType.STOP)
+    
+    def _change_instance_states(
+        self,
+        instances: Iterable[EC2Resource],
+        action: ActionType
+    ) -> List[OperationResult]:
+        """
+        Start or stop instances with one API call per batch of instance IDs
+        
+        The cached instance state is not pre-checked: EC2 reports each instance's
+        previous and current state, which is classified in _change_batch_state.
+        
+        Args:
+            instances: EC2Resource objects to act on; batches are cut from the iterable as it is consumed
+            action: ActionType.START or ActionType.STOP
+            
+        Returns:
+            List of OperationResult objects, one per instance
+        """
         results = []
+        successful = 0
+        remaining = iter(instances)
+        first = list(itertools.islice(remaining, MAX_INSTANCES_PER_CALL))
+        second = list(itertools.islice(remaining, MAX_INSTANCES_PER_CALL)) if first else []
         
-        for instance in instances:
-            result = self._stop_single_instance(instance)
-            results.append(result)
+        if not first:
+            batch_results = []
+        elif not second:
+            batch_results = [self._change_batch_state(first, action, MAX_CONCURRENT_BATCHES)]
+        else:
+            # Each batch is an independent HTTPS round-trip, so issue them concurrently, submitting
+            # later batches as the (possibly still paginating) iterable produces them; results are
+            # gathered in submit order so they line up with the input
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BATCHES) as executor:
+                futures = [
+                    executor.submit(self._change_batch_state, batch, action, FALLBACK_THREADS_PER_BATCH)
+                    for batch in (first, second)
+                ]
+                while batch := list(itertools.islice(remaining, MAX_INSTANCES_PER_CALL)):
+                    futures.append(executor.submit(self._change_batch_state, batch, action, FALLBACK_THREADS_PER_BATCH))
+                batch_results = [future.result() for future in futures]
         
-        # Log summary
-        successful = sum(1 for r in results if r.success)
-        self.logger.info(f"Stop operation completed: {successful}/{len(results)} successful")
+        # Count successes while collecting instead of walking the results again for the summary
+        append = results.append
+        for result in itertools.chain.from_iterable(batch_results):
+            successful += result.success
+            append(result)
         
+        self.logger.info(
+            "%s operation completed: %s/%s successful", action.value.capitalize(), successful, len(results)
+        )
         return results
     
+    def _change_batch_state(
+        self,
+        batch: List[EC2Resource],
+        action: ActionType,
+        fallback_threads: int = MAX_CONCURRENT_BATCHES
+    ) -> List[OperationResult]:
+        """
+        Issue a single StartInstances/StopInstances call for a batch of eligible instances
+        
+        If the call fails, the instances are retried individually on up to fallback_threads threads.
+        """
+        single_call = (
+            self._start_single_instance if action == ActionType.START else self._stop_single_instance
+        )
+        instance_ids = [instance.instance_id for instance in batch]
+        
+        try:
+            if action == ActionType.START:
+                response = self.ec2_client.start_instances(InstanceIds=instance_ids)
+                changed = response.get('StartingInstances', [])
+            else:
+                response = self.ec2_client.stop_instances(InstanceIds=instance_ids)
+                changed = response.get('StoppingInstances', [])
+        except ClientError as e:
+            # One bad instance fails the whole call; retry individually so the rest still proceed
+            error_code = e.response['Error']['Code']
+            self.logger.warning(
+                "Batch %s of %s instances failed (%s), retrying instances individually",
+                action.value, len(batch), error_code
+            )
+            if error_code == 'IncorrectInstanceState':
+                # Some cached states are stale; refresh them so the single calls skip ineligible instances
+                batch = self._refresh_states(batch)
+            with ThreadPoolExecutor(max_workers=min(fallback_threads, len(batch))) as executor:
+                return list(executor.map(single_call, batch))
+        except Exception as e:
+            self.logger.error("Unexpected error during batch %s of %s: %s", action.value, instance_ids, e)
+            timestamp = datetime.datetime.now(datetime.timezone.utc)
+            return [
+                OperationResult(
+                    success=False,
+                    instance_id=instance_id,
+                    action=action.value,
+                    message=f"Unexpected error: {str(e)}",
+                    timestamp=timestamp
+                )
+                for instance_id in instance_ids
+            ]
+        
+        # A request for an instance already in the target state is a no-op that EC2 still reports
+        target_state = InstanceState.RUNNING.value if action == ActionType.START else InstanceState.STOPPED.value
+        changed_by_id = {item['InstanceId']: item for item in changed}
+        self.logger.info("Successfully initiated %s for %s instances", action.value, len(changed_by_id))
+        
+        # One clock read per batch rather than one per OperationResult
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        results = []
+        for instance_id in instance_ids:
+            item = changed_by_id.get(instance_id)
+            if item is not None:
+                if item.get('PreviousState', {}).get('Name') == target_state:
+                    message = f"Instance already {target_state}"
+                else:
+                    message = f"{action.value.capitalize()} initiated, current state: {item['CurrentState']['Name']}"
+                results.append(OperationResult(
+                    success=True,
+                    instance_id=instance_id,
+                    action=action.value,
+                    message=message,
+                    timestamp=timestamp
+                ))
+            else:
+                results.append(OperationResult(
+                    success=False,
+                    instance_id=instance_id,
+                    action=action.value,
+                    message=f"Instance not returned in {action.value} response",
+                    timestamp=timestamp
+                ))
+        
+        return results
+    
+    def _refresh_states(self, instances: List[EC2Resource]) -> List[EC2Resource]:
+        """Return copies of instances carrying their live state, or the originals if the lookup fails"""
+        try:
+            live_states = self.get_states([instance.instance_id for instance in instances])
+        except Exception as e:
+            self.logger.warning("Could not refresh instance states: %s", e)
+            return instances
+        return [
+            replace(instance, state=live_states.get(instance.instance_id, instance.state))
+            for instance in instances
+        ]
+    
     def _start_single_instance(self, instance: EC2Resource) -> OperationResult:
         """Start a single EC2 instance with retry logic"""
         try:
@@ -301,7 +557,7 @@ class EC2Manager:
                 starting_instance = response['StartingInstances'][0]
                 current_state = starting_instance['CurrentState']['Name']
                 
-                self.logger.info(f"Successfully initiated start for {instance.instance_id}")
+                self.logger.debug("Successfully initiated start for %s", instance.instance_id)
                 
                 return OperationResult(
                     success=True,
@@ -321,7 +577,7 @@ class EC2Manager:
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
             
-            self.logger.error(f"AWS API error starting {instance.instance_id}: {error_code} - {error_message}")
+            self.logger.error("AWS API error starting %s: %s - %s", instance.instance_id, error_code, error_message)
             
             return OperationResult(
                 success=False,
@@ -331,7 +587,7 @@ class EC2Manager:
                 error_code=error_code
             )
         except Exception as e:
-            self.logger.error(f"Unexpected error starting {instance.instance_id}: {e}")
+            self.logger.error("Unexpected error starting %s: %s", instance.instance_id, e)
             
             return OperationResult(
                 success=False,
@@ -360,7 +616,7 @@ class EC2Manager:
                 stopping_instance = response['StoppingInstances'][0]
                 current_state = stopping_instance['CurrentState']['Name']
                 
-                self.logger.info(f"Successfully initiated stop for {instance.instance_id}")
+                self.logger.debug("Successfully initiated stop for %s", instance.instance_id)
                 
                 return OperationResult(
                     success=True,
@@ -380,7 +636,7 @@ class EC2Manager:
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
             
-            self.logger.error(f"AWS API error stopping {instance.instance_id}: {error_code} - {error_message}")
+            self.logger.error("AWS API error stopping %s: %s - %s", instance.instance_id, error_code, error_message)
             
             return OperationResult(
                 success=False,
@@ -390,7 +646,7 @@ class EC2Manager:
                 error_code=error_code
             )
         except Exception as e:
-            self.logger.error(f"Unexpected error stopping {instance.instance_id}: {e}")
+            self.logger.error("Unexpected error stopping %s: %s", instance.instance_id, e)
             
             return OperationResult(
                 success=False,
@@ -399,11 +655,39 @@ class EC2Manager:
                 message=f"Unexpected error: {str(e)}"
             )
     
-    def _create_ec2_resource(self, instance_data: Dict) -> EC2Resource:
-        """Create EC2Resource from AWS API response"""
-        tags = {}
-        if 'Tags' in instance_data:
-            tags = {tag['Key']: tag['Value'] for tag in instance_data['Tags']}
+    @staticmethod
+    def _time_tag_filter(tag_name: str, current_minutes: int, time_window_minutes: int) -> Dict[str, Any]:
+        """
+        Build a DescribeInstances filter matching the HH:MM tag values inside the window
+        
+        Falls back to a tag-key filter when the window is too wide to enumerate.
+        """
+        if 2 * time_window_minutes + 1 > MAX_TIME_TAG_FILTER_MINUTES:
+            return {'Name': 'tag-key', 'Values': [tag_name]}
+        
+        values = []
+        for offset in range(-time_window_minutes, time_window_minutes + 1):
+            hours, minutes = divmod((current_minutes + offset) % 1440, 60)
+            values.append(f"{hours:02d}:{minutes:02d}")
+        return {'Name': f'tag:{tag_name}', 'Values': values}
+    
+    def _iter_instances_with_tags(self, **describe_kwargs) -> Iterator[Tuple[Dict, Dict[str, str]]]:
+        """Yield (instance, tag dict) pairs from DescribeInstances, following NextToken directly"""
+        # A plain NextToken loop avoids the per-page overhead of botocore's paginator
+        while True:
+            page = self.ec2_client.describe_instances(**describe_kwargs)
+            # Flatten reservations -> instances in C rather than with a nested Python loop
+            for instance in itertools.chain.from_iterable(r['Instances'] for r in page['Reservations']):
+                yield instance, {tag['Key']: tag['Value'] for tag in instance.get('Tags', ())}
+            next_token = page.get('NextToken')
+            if not next_token:
+                return
+            describe_kwargs['NextToken'] = next_token
+    
+    def _create_ec2_resource(self, instance_data: Dict, tags: Optional[Dict[str, str]] = None) -> EC2Resource:
+        """Create EC2Resource from AWS API response, reusing an already-built tag dict if given"""
+        if tags is None:
+            tags = {tag['Key']: tag['Value'] for tag in instance_data.get('Tags', ())}
         
         return EC2Resource(
             instance_id=instance_data['InstanceId'],
@@ -416,83 +700,140 @@ class EC2Manager:
             public_ip=instance_data.get('PublicIpAddress')
         )
     
+    @staticmethod
+    def _parse_time_minutes(time_str: str) -> Optional[int]:
+        """Parse an HH:MM tag value into minutes since midnight, or None if it is malformed"""
+        # Plain string checks instead of the regex engine; accepts exactly what _TIME_RE accepts
+        if not (
+            len(time_str) == 5 and time_str[2] == ':' and time_str.isascii()
+            and time_str[:2].isdigit() and time_str[3:].isdigit()
+        ):
+            return None
+        hours, minutes = int(time_str[:2]), int(time_str[3:])
+        if hours > 23 or minutes > 59:
+            return None
+        return hours * 60 + minutes
+    
     def _validate_time_format(self, time_str: str) -> bool:
         """Validate time format (HH:MM)"""
-        pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-        return bool(re.match(pattern, time_str))
+        return bool(_TIME_RE.match(time_str.strip()))
+
+
+# Timezone last applied with TZ + tzset by TimezoneManager.set_timezone
+_APPLIED_TZ: Optional[str] = None
 
 
 class TimezoneManager:
     """Enhanced timezone management with validation"""
     
-    SUPPORTED_TIMEZONES = {
-        'UTC': 'UTC',
-        'US/Eastern': 'US/Eastern',
-        'US/Pacific': 'US/Pacific',
-        'US/Central': 'US/Central',
-        'US/Mountain': 'US/Mountain',
-        'Europe/London': 'Europe/London',
-        'Europe/Paris': 'Europe/Paris',
-        'Europe/Berlin': 'Europe/Berlin',
-        'Asia/Tokyo': 'Asia/Tokyo',
-        'Asia/Singapore': 'Asia/Singapore',
-        'Asia/Kolkata': 'Asia/Kolkata',
-        'Australia/Sydney': 'Australia/Sydney'
-    }
+    SUPPORTED_TIMEZONES = frozenset({
+        'UTC',
+        'US/Eastern',
+        'US/Pacific',
+        'US/Central',
+        'US/Mountain',
+        'Europe/London',
+        'Europe/Paris',
+        'Europe/Berlin',
+        'Asia/Tokyo',
+        'Asia/Singapore',
+        'Asia/Kolkata',
+        'Australia/Sydney'
+    })
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
     
+    def resolve_timezone(self, timezone_str: Optional[str] = None) -> str:
+        """
+        Resolve and validate the timezone without changing process state
+        
+        Args:
+            timezone_str: Timezone string (defaults to environment variable)
+            
+        Returns:
+            Supported timezone string, or UTC
+        """
+        # Get timezone from parameter, environment, or default
+        timezone = (
+            timezone_str or 
+            os.environ.get('REGION_TZ') or 
+            os.environ.get('TZ') or 
+            'UTC'
+        )
+        
+        # Validate timezone
+        if timezone not in self.SUPPORTED_TIMEZONES:
+            self.logger.warning("Unsupported timezone '%s', falling back to UTC", timezone)
+            timezone = 'UTC'
+        
+        return timezone
+    
     def set_timezone(self, timezone_str: Optional[str] = None) -> str:
         """
         Set timezone with validation and fallback
         
+        Prefer resolve_timezone() with get_tzinfo() and datetime.now(tz), which
+        avoid mutating os.environ['TZ'] and calling time.tzset().
+        
         Args:
             timezone_str: Timezone string (defaults to environment variable)
             
         Returns:
             Applied timezone string
         """
+        global _APPLIED_TZ
         try:
-            # Get timezone from parameter, environment, or default
-            timezone = (
-                timezone_str or 
-                os.environ.get('REGION_TZ') or 
-                os.environ.get('TZ') or 
-                'UTC'
-            )
+            timezone = self.resolve_timezone(timezone_str)
             
-            # Validate timezone
-            if timezone not in self.SUPPORTED_TIMEZONES:
-                self.logger.warning(f"Unsupported timezone '{timezone}', falling back to UTC")
-                timezone = 'UTC'
+            # Warm invocations usually apply the same timezone again; skip the tzset then
+            if timezone == _APPLIED_TZ and os.environ.get('TZ') == timezone:
+                return timezone
             
-            # Log current time before setting
-            time_before = datetime.datetime.now()
-            self.logger.info(f"Time before timezone setting: {time_before}")
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug("Time before timezone setting: %s", datetime.datetime.now())
             
             # Set timezone
             os.environ['TZ'] = timezone
             time.tzset()
+            _APPLIED_TZ = timezone
             
-            # Log current time after setting
-            time_after = datetime.datetime.now()
-            self.logger.info(f"Time after setting timezone to {timezone}: {time_after}")
+            if debug:
+                self.logger.debug("Time after setting timezone to %s: %s", timezone, datetime.datetime.now())
             
             return timezone
             
         except Exception as e:
-            self.logger.error(f"Error setting timezone: {e}, falling back to UTC")
+            self.logger.error("Error setting timezone: %s, falling back to UTC", e)
             os.environ['TZ'] = 'UTC'
             time.tzset()
+            _APPLIED_TZ = 'UTC'
             return 'UTC'
+    
+    def get_tzinfo(self, timezone_str: str) -> datetime.tzinfo:
+        """
+        Get a tzinfo object for timezone-aware datetime.now() calls
+        
+        Args:
+            timezone_str: Timezone string (e.g. the value returned by set_timezone)
+            
+        Returns:
+            ZoneInfo for the timezone, or UTC if it cannot be loaded
+        """
+        try:
+            return ZoneInfo(timezone_str)
+        except (ZoneInfoNotFoundError, ValueError):
+            self.logger.warning("Unknown timezone '%s', using UTC", timezone_str)
+            return ZoneInfo('UTC')
 
 
 class TagValidator:
     """Enhanced tag validation with comprehensive checks"""
     
-    BOOLEAN_TRUE_VALUES = {'true', 'True', 'TRUE', '1', 'yes', 'Yes', 'YES', 'on', 'On', 'ON'}
-    BOOLEAN_FALSE_VALUES = {'false', 'False', 'FALSE', '0', 'no', 'No', 'NO', 'off', 'Off', 'OFF'}
+    # Canonical lowercase values; tag values are lowercased before lookup so any casing matches
+    BOOLEAN_TRUE_VALUES = frozenset({'true', '1', 'yes', 'on'})
+    BOOLEAN_FALSE_VALUES = frozenset({'false', '0', 'no', 'off'})
     
     @staticmethod
     def validate_boolean_tag(tag_value: str) -> bool:
@@ -508,8 +849,7 @@ class TagValidator:
         if not tag_value:
             return False
         
-        tag_value = tag_value.strip()
-        return tag_value in TagValidator.BOOLEAN_TRUE_VALUES
+        return tag_value.strip().lower() in TagValidator.BOOLEAN_TRUE_VALUES
     
     @staticmethod
     def validate_time_tag(tag_value: str) -> bool:
@@ -525,8 +865,26 @@ class TagValidator:
         if not tag_value:
             return False
         
-        pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-        return bool(re.match(pattern, tag_value.strip()))
+        return bool(_TIME_RE.match(tag_value.strip()))
+
+
+def get_event_instance_ids(event: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Extract instance IDs carried by an invocation event
+    
+    Args:
+        event: Lambda event data ('instance_ids' or an EventBridge 'detail.instance-id')
+        
+    Returns:
+        List of instance IDs, empty for scheduled invocations
+    """
+    event = event or {}
+    instance_ids = event.get('instance_ids') or (event.get('detail') or {}).get('instance-id')
+    if not instance_ids:
+        return []
+    if isinstance(instance_ids, str):
+        return [instance_ids]
+    return list(instance_ids)
 
 
 def create_lambda_response(
@@ -547,18 +905,22 @@ def create_lambda_response(
     Returns:
         Standardized response dictionary
     """
-    successful = sum(1 for r in results if r.success)
-    failed = len(results) - successful
+    # Serialize and count successes in a single pass over the results
+    serialized_results = []
+    successful = 0
+    for result in results:
+        successful += result.success
+        serialized_results.append(result.to_dict())
     
     response_body = {
         'action': action,
         'summary': {
             'total_processed': len(results),
             'successful': successful,
-            'failed': failed
+            'failed': len(results) - successful
         },
-        'results': [asdict(result) for result in results],
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'results': serialized_results,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat()
     }
     
     if additional_info:
@@ -569,10 +931,26 @@ def create_lambda_response(
         'headers': {
             'Content-Type': 'application/json'
         },
-        'body': json.dumps(response_body, default=str)
+        'body': _dumps_json(response_body)
     }
 
 
+def _dumps_json(payload: Dict[str, Any]) -> str:
+    """Serialize a response body, using orjson when available"""
+    if orjson is not None:
+        # Pass datetimes through to default=str so output matches the stdlib encoder
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode()
+    return json.dumps(payload, default=str)
+
+
+# Handler installed by configure_logging(), kept so repeat calls are a no-op
+_LOG_HANDLER: Optional[logging.Handler] = None
+
+
 def configure_logging(level: str = None) -> logging.Logger:
     """
     Configure enhanced logging for Lambda functions
@@ -583,8 +961,15 @@ def configure_logging(level: str = None) -> logging.Logger:
     Returns:
         Configured logger
     """
+    global _LOG_HANDLER
     logger = logging.getLogger()
     
+    # Already configured in this execution environment; only honour an explicit level
+    if _LOG_HANDLER is not None and _LOG_HANDLER in logger.handlers:
+        if level:
+            logger.setLevel(level.upper())
+        return logger
+    
     # Remove existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
@@ -601,17 +986,20 @@ def configure_logging(level: str = None) -> logging.Logger:
     log_level = level or os.environ.get('LOG_LEVEL', 'INFO')
     logger.setLevel(log_level.upper())
     
+    _LOG_HANDLER = handler
     return logger
 
 
 # Backward compatibility functions
 def get_ec2_client():
     """Backward compatibility function"""
-    return boto3.client('ec2')
+    return _get_ec2_client(os.environ.get('AWS_REGION', 'us-east-1'))
 
 
 def get_instances_by_tag(ec2_client, tag_name, tag_values, instance_states):
     """Backward compatibility function"""
+    if not tag_values:
+        return []
     manager = EC2Manager()
     instances = manager.get_instances_by_tag(tag_name, tag_values, instance_states)
     return [instance.instance_id for instance in instances]
@@ -624,10 +1012,10 @@ def start_ec2_instances(ec2_client, instance_ids):
     
     try:
         response = ec2_client.start_instances(InstanceIds=instance_ids)
-        logging.info(f"Successfully initiated start for instances: {instance_ids}")
+        logging.info("Successfully initiated start for instances: %s", instance_ids)
         return response
     except Exception as e:
-        logging.error(f"Error starting instances {instance_ids}: {e}")
+        logging.error("Error starting instances %s: %s", instance_ids, e)
         raise
 
 
@@ -638,10 +1026,10 @@ def stop_ec2_instances(ec2_client, instance_ids):
     
     try:
         response = ec2_client.stop_instances(InstanceIds=instance_ids)
-        logging.info(f"Successfully initiated stop for instances: {instance_ids}")
+        logging.info("Successfully initiated stop for instances: %s", instance_ids)
         return response
     except Exception as e:
-        logging.error(f"Error stopping instances {instance_ids}: {e}")
+        logging.error("Error stopping instances %s: %s", instance_ids, e)
         raise
 
 
@@ -653,6 +1041,9 @@ def set_region_timezone():
 
 def get_instances_by_time_tag(ec2_client, tag_name, current_time, time_window_minutes=5, weekday_filter=None):
     """Backward compatibility function"""
+    # An excluded weekday matches nothing, so don't build a manager for it
+    if weekday_filter and not (weekday_filter[0] <= current_time.isoweekday() <= weekday_filter[1]):
+        return []
     manager = EC2Manager()
     instances = manager.get_instances_by_time_tag(tag_name, current_time, time_window_minutes, weekday_filter)
     return [
@@ -667,26 +1058,31 @@ def get_instances_by_time_tag(ec2_client, tag_name, current_time, time_window_mi
 
 def process_time_based_instances(ec2_client, instances_data, target_state, action):
     """Backward compatibility function"""
+    if not instances_data:
+        return 0
     logger = logging.getLogger()
-    processed_count = 0
+    eligible = []
     
     for instance_data in instances_data:
         instance_id = instance_data['instance_id']
         current_state = instance_data['current_state']
-        scheduled_time = instance_data['scheduled_time']
         
         if current_state == target_state:
-            try:
-                if action == 'start':
-                    ec2_client.start_instances(InstanceIds=[instance_id])
-                    logger.info(f"Started instance {instance_id} scheduled for {scheduled_time}")
-                elif action == 'stop':
-                    ec2_client.stop_instances(InstanceIds=[instance_id])
-                    logger.info(f"Stopped instance {instance_id} scheduled for {scheduled_time}")
-                processed_count += 1
-            except Exception as e:
-                logger.error(f"Error {action}ing instance {instance_id}: {e}")
+            eligible.append(EC2Resource(
+                instance_id=instance_id,
+                state=current_state,
+                instance_type='',
+                availability_zone='',
+                tags={}
+            ))
         else:
-            logger.info(f"Instance {instance_id} not in {target_state} state (current: {current_state})")
+            logger.debug("Instance %s not in %s state (current: %s)", instance_id, target_state, current_state)
     
-    return processed_count
+    if not eligible:
+        return 0
+    
+    # Reuse the manager's batched, concurrent calls and per-instance fallback against the caller's client
+    manager = EC2Manager()
+    manager.ec2_client = ec2_client
+    results = manager._change_instance_states(eligible, ActionType(action))
+    return sum(result.success for result in results)
@@ -0,0 +1,70 @@
+"""
+Test Suite for the AutoEc2Lifecycle Lambda Handler
+
+Checks that the single lifecycle handler routes 'start' and 'stop' actions to the
+right tag, instance state and EC2 call, and rejects anything else.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import os
+import sys
+
+# Add the lambda layer and handlers to the path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_layer', 'python'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda'))
+
+# The handler creates and warms its EC2 client at import time
+with patch('ec2_utils.get_ec2_client'), patch('ec2_utils.warm_ec2_connection'):
+    import AutoEc2Lifecycle
+
+
+class TestAutoEc2Lifecycle(unittest.TestCase):
+    """Test action routing in AutoEc2Lifecycle.lambda_handler"""
+
+    def setUp(self):
+        self.ec2_client = Mock()
+        self.ec2_client.describe_instances.return_value = {
+            'Reservations': [{'Instances': [{'InstanceId': 'i-1'}, {'InstanceId': 'i-2'}]}]
+        }
+        patcher = patch.object(AutoEc2Lifecycle, '_EC2_CLIENT', self.ec2_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _describe_filters(self):
+        return {f['Name']: f['Values'] for f in self.ec2_client.describe_instances.call_args.kwargs['Filters']}
+
+    def test_start_routes_to_autostart_stopped(self):
+        """'start' looks up stopped AutoStart instances and starts them"""
+        response = AutoEc2Lifecycle.lambda_handler({'action': 'start'}, None)
+
+        filters = self._describe_filters()
+        self.assertIn('tag:AutoStart', filters)
+        self.assertEqual(filters['instance-state-name'], ['stopped'])
+        self.ec2_client.start_instances.assert_called_once_with(InstanceIds=['i-1', 'i-2'])
+        self.ec2_client.stop_instances.assert_not_called()
+        self.assertEqual(response, {'statusCode': 200, 'body': 'Processed 2 instances for auto-start'})
+
+    def test_stop_routes_to_autostop_running(self):
+        """'stop' looks up running AutoStop instances and stops them"""
+        response = AutoEc2Lifecycle.lambda_handler({'action': 'stop'}, None)
+
+        filters = self._describe_filters()
+        self.assertIn('tag:AutoStop', filters)
+        self.assertEqual(filters['instance-state-name'], ['running'])
+        self.ec2_client.stop_instances.assert_called_once_with(InstanceIds=['i-1', 'i-2'])
+        self.ec2_client.start_instances.assert_not_called()
+        self.assertEqual(response['body'], 'Processed 2 instances for auto-stop')
+
+    def test_invalid_or_missing_action_raises(self):
+        """Unknown, missing or absent actions raise ValueError without touching EC2"""
+        for event in ({'action': 'reboot'}, {'action': None}, {}, None):
+            with self.subTest(event=event):
+                with self.assertRaises(ValueError):
+                    AutoEc2Lifecycle.lambda_handler(event, None)
+
+        self.ec2_client.describe_instances.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,8 +15,12 @@ import datetime
 import json
 import os
 import sys
+import time
 from typing import Dict, List
 
+import boto3
+from moto import mock_ec2
+
 # Add the lambda layer to the path for testing
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_layer', 'python'))
 
@@ -29,8 +33,12 @@ from ec2_utils_improved import (
     InstanceState,
     ActionType,
     create_lambda_response,
-    configure_logging
+    get_event_instance_ids,
+    configure_logging,
+    process_time_based_instances
 )
+import ec2_utils_improved
+from ec2_config import DEFAULT_SCHED_THREADS, get_sched_threads
 
 
 class TestEC2Resource(unittest.TestCase):
@@ -105,13 +113,32 @@ class TestOperationResult(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertEqual(result.error_code, 'InvalidInstanceState')
 
+    def test_operation_result_to_dict(self):
+        """Test OperationResult serializes to a flat JSON-ready dict"""
+        result = OperationResult(
+            success=True,
+            instance_id='i-1234567890abcdef0',
+            action='start',
+            message='Start initiated',
+            timestamp=datetime.datetime(2024, 1, 1, 9, 0)
+        )
+
+        self.assertEqual(result.to_dict(), {
+            'success': True,
+            'instance_id': 'i-1234567890abcdef0',
+            'action': 'start',
+            'message': 'Start initiated',
+            'error_code': None,
+            'timestamp': '2024-01-01T09:00:00'
+        })
+
 
 class TestTagValidator(unittest.TestCase):
     """Test TagValidator functionality"""
     
     def test_validate_boolean_tag_true_values(self):
         """Test boolean tag validation for true values"""
-        true_values = ['true', 'True', 'TRUE', '1', 'yes', 'Yes', 'YES', 'on', 'On', 'ON']
+        true_values = ['true', 'True', 'TRUE', 'TRue', ' yes ', '1', 'yes', 'Yes', 'YES', 'on', 'On', 'ON']
         
         for value in true_values:
             with self.subTest(value=value):
@@ -171,14 +198,40 @@ class TestTimezoneManager(unittest.TestCase):
             timezone = self.timezone_manager.set_timezone()
             self.assertEqual(timezone, 'UTC')
 
+    def test_set_timezone_skips_tzset_when_unchanged(self):
+        """Test re-applying the current timezone does not call tzset again"""
+        with patch.dict(os.environ, {}, clear=True), patch('time.tzset') as mock_tzset:
+            self.timezone_manager.set_timezone('Asia/Tokyo')
+            self.timezone_manager.set_timezone('Asia/Tokyo')
+            self.assertEqual(mock_tzset.call_count, 1)
+
+            self.timezone_manager.set_timezone('Europe/Paris')
+            self.assertEqual(mock_tzset.call_count, 2)
+
+    def test_resolve_timezone_leaves_process_tz_untouched(self):
+        """Test resolving the timezone does not modify os.environ['TZ']"""
+        with patch.dict(os.environ, {'REGION_TZ': 'Asia/Tokyo'}, clear=True):
+            self.assertEqual(self.timezone_manager.resolve_timezone(), 'Asia/Tokyo')
+            self.assertNotIn('TZ', os.environ)
+
+    def test_get_tzinfo(self):
+        """Test tzinfo lookup with UTC fallback for unknown timezones"""
+        self.assertEqual(str(self.timezone_manager.get_tzinfo('Europe/London')), 'Europe/London')
+        self.assertEqual(str(self.timezone_manager.get_tzinfo('Invalid/Timezone')), 'UTC')
+
 
 class TestEC2Manager(unittest.TestCase):
     """Test EC2Manager functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build one manager around a mocked client for the whole class"""
+        with patch.object(boto3, 'client'), patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True):
+            cls.ec2_manager = EC2Manager('us-east-1')
+    
     def setUp(self):
-        """Set up test environment"""
-        with patch('boto3.client'), patch('boto3.resource'):
-            self.ec2_manager = EC2Manager('us-east-1')
+        """Clear calls and canned responses left on the shared client by earlier tests"""
+        self.ec2_manager.ec2_client.reset_mock(return_value=True, side_effect=True)
     
     def test_validate_time_format_valid(self):
         """Test time format validation for valid times"""
@@ -195,7 +248,17 @@ class TestEC2Manager(unittest.TestCase):
         for time_str in invalid_times:
             with self.subTest(time=time_str):
                 self.assertFalse(self.ec2_manager._validate_time_format(time_str))
-    
+
+    def test_parse_time_minutes(self):
+        """Test parsing time tag values into minutes since midnight"""
+        self.assertEqual(self.ec2_manager._parse_time_minutes('00:00'), 0)
+        self.assertEqual(self.ec2_manager._parse_time_minutes('09:05'), 545)
+        self.assertEqual(self.ec2_manager._parse_time_minutes('23:59'), 1439)
+
+        for time_str in ['24:00', '12:60', '9:30', '12:5', 'invalid', '', '1:2:3', '+9:30']:
+            with self.subTest(time=time_str):
+                self.assertIsNone(self.ec2_manager._parse_time_minutes(time_str))
+
     def test_create_ec2_resource(self):
         """Test creating EC2Resource from AWS API response"""
         instance_data = {
@@ -222,17 +285,32 @@ class TestEC2Manager(unittest.TestCase):
         self.assertEqual(resource.private_ip, '10.0.1.100')
         self.assertEqual(resource.public_ip, '54.123.45.67')
     
-    @patch('boto3.client')
+    @patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True)
+    @patch.object(boto3, 'resource')
+    @patch.object(boto3, 'client')
+    def test_ec2_client_shared_per_region(self, mock_boto_client, mock_resource):
+        """Test managers for the same region reuse one EC2 client and build no resource"""
+        first = EC2Manager('us-east-1')
+        second = EC2Manager('us-east-1')
+        other = EC2Manager('eu-west-1')
+        
+        self.assertIs(first.ec2_client, second.ec2_client)
+        self.assertEqual(mock_boto_client.call_count, 2)
+        self.assertEqual(
+            [c.kwargs['region_name'] for c in mock_boto_client.call_args_list],
+            ['us-east-1', 'eu-west-1']
+        )
+        self.assertIsNotNone(other.ec2_client)
+        mock_resource.assert_not_called()
+    
+    @patch.object(boto3, 'client')
     def test_get_instances_by_tag(self, mock_boto_client):
         """Test getting instances by tag"""
         # Mock EC2 client response
         mock_client = Mock()
         mock_boto_client.return_value = mock_client
         
-        mock_paginator = Mock()
-        mock_client.get_paginator.return_value = mock_paginator
-        
-        mock_paginator.paginate.return_value = [
+        mock_client.describe_instances.side_effect = [
             {
                 'Reservations': [
                     {
@@ -251,7 +329,7 @@ class TestEC2Manager(unittest.TestCase):
         ]
         
         # Reinitialize manager with mocked client
-        with patch('boto3.resource'):
+        with patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True):
             ec2_manager = EC2Manager('us-east-1')
         
         instances = ec2_manager.get_instances_by_tag(
@@ -263,7 +341,140 @@ class TestEC2Manager(unittest.TestCase):
         self.assertEqual(len(instances), 1)
         self.assertEqual(instances[0].instance_id, 'i-1234567890abcdef0')
         self.assertEqual(instances[0].state, 'stopped')
-    
+        self.assertEqual(
+            mock_client.describe_instances.call_args.kwargs['MaxResults'], 1000
+        )
+
+    def test_get_instances_by_tag_with_instance_ids(self):
+        """Test instance IDs from the event are looked up directly"""
+        self.ec2_manager.ec2_client.describe_instances.return_value = {'Reservations': []}
+
+        self.ec2_manager.get_instances_by_tag(
+            tag_name='AutoStart',
+            tag_values=['*'],
+            instance_states=['stopped'],
+            instance_ids=get_event_instance_ids({'detail': {'instance-id': 'i-1'}})
+        )
+
+        kwargs = self.ec2_manager.ec2_client.describe_instances.call_args.kwargs
+        self.assertEqual(kwargs['InstanceIds'], ['i-1'])
+        self.assertNotIn('MaxResults', kwargs)
+        self.assertIn({'Name': 'tag:AutoStart', 'Values': ['*']}, kwargs['Filters'])
+
+    def test_get_instances_by_tag_follows_next_token(self):
+        """Test DescribeInstances pages are followed until NextToken is exhausted"""
+        def page(instance_id, **extra):
+            return {
+                'Reservations': [{
+                    'Instances': [{
+                        'InstanceId': instance_id,
+                        'State': {'Name': 'stopped'},
+                        'InstanceType': 't3.micro',
+                        'Placement': {'AvailabilityZone': 'us-east-1a'},
+                        'Tags': [{'Key': 'AutoStart', 'Value': 'true'}]
+                    }]
+                }],
+                **extra
+            }
+
+        describe = self.ec2_manager.ec2_client.describe_instances
+        describe.side_effect = [page('i-1', NextToken='token-1'), page('i-2')]
+
+        instances = self.ec2_manager.get_instances_by_tag('AutoStart', ['true'])
+
+        self.assertEqual([i.instance_id for i in instances], ['i-1', 'i-2'])
+        self.assertEqual(describe.call_count, 2)
+        self.assertEqual(describe.call_args.kwargs['NextToken'], 'token-1')
+
+    def test_get_event_instance_ids(self):
+        """Test instance ID extraction from invocation events"""
+        self.assertEqual(get_event_instance_ids({}), [])
+        self.assertEqual(get_event_instance_ids(None), [])
+        self.assertEqual(get_event_instance_ids({'instance_ids': ['i-1', 'i-2']}), ['i-1', 'i-2'])
+        self.assertEqual(get_event_instance_ids({'detail': {'instance-id': 'i-3'}}), ['i-3'])
+
+    def test_get_instances_by_time_tag(self):
+        """Test getting instances by time tag filters on the tag key server-side"""
+        self.ec2_manager.ec2_client.describe_instances.side_effect = [
+            {
+                'Reservations': [
+                    {
+                        'Instances': [
+                            {
+                                'InstanceId': 'i-1234567890abcdef0',
+                                'State': {'Name': 'stopped'},
+                                'InstanceType': 't3.micro',
+                                'Placement': {'AvailabilityZone': 'us-east-1a'},
+                                'Tags': [{'Key': 'StartWeekDay', 'Value': '09:00'}]
+                            },
+                            {
+                                'InstanceId': 'i-0987654321fedcba0',
+                                'State': {'Name': 'stopped'},
+                                'InstanceType': 't3.micro',
+                                'Placement': {'AvailabilityZone': 'us-east-1a'},
+                                'Tags': [{'Key': 'StartWeekDay', 'Value': '18:00'}]
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+
+        instances = self.ec2_manager.get_instances_by_time_tag(
+            tag_name='StartWeekDay',
+            current_time=datetime.datetime(2024, 1, 1, 9, 2),
+            time_window_minutes=5,
+            weekday_filter=(1, 5)
+        )
+
+        self.assertEqual([i.instance_id for i in instances], ['i-1234567890abcdef0'])
+        filters = self.ec2_manager.ec2_client.describe_instances.call_args.kwargs['Filters']
+        time_filter = next(f for f in filters if f['Name'] == 'tag:StartWeekDay')
+        self.assertIn('09:00', time_filter['Values'])
+        self.assertIn('09:07', time_filter['Values'])
+        self.assertNotIn('09:08', time_filter['Values'])
+        self.assertIn({'Name': 'instance-state-name', 'Values': ['running', 'stopped']}, filters)
+
+    def test_get_instances_by_time_tag_window_wraps_midnight(self):
+        """Test the time window matches schedules on both sides of midnight"""
+        self.ec2_manager.ec2_client.describe_instances.side_effect = [
+            {
+                'Reservations': [
+                    {
+                        'Instances': [
+                            {
+                                'InstanceId': f'i-{value.replace(":", "")}',
+                                'State': {'Name': 'running'},
+                                'InstanceType': 't3.micro',
+                                'Placement': {'AvailabilityZone': 'us-east-1a'},
+                                'Tags': [{'Key': 'StopWeekDay', 'Value': value}]
+                            }
+                            for value in ('23:58', '00:02', '00:10', '23:50')
+                        ]
+                    }
+                ]
+            }
+        ]
+
+        instances = self.ec2_manager.get_instances_by_time_tag(
+            tag_name='StopWeekDay',
+            current_time=datetime.datetime(2024, 1, 1, 23, 59),
+            time_window_minutes=5
+        )
+
+        self.assertEqual([i.instance_id for i in instances], ['i-2358', 'i-0002'])
+
+    def test_get_instances_by_time_tag_skips_excluded_weekday(self):
+        """Test no DescribeInstances call is made when the weekday filter excludes today"""
+        instances = self.ec2_manager.get_instances_by_time_tag(
+            tag_name='StartWeekEnd',
+            current_time=datetime.datetime(2024, 1, 1, 9, 0),  # Monday
+            weekday_filter=(6, 7)
+        )
+
+        self.assertEqual(instances, [])
+        self.ec2_manager.ec2_client.describe_instances.assert_not_called()
+
     def test_start_single_instance_success(self):
         """Test starting a single instance successfully"""
         # Create a test instance
@@ -339,6 +550,277 @@ class TestEC2Manager(unittest.TestCase):
         self.assertEqual(result.action, 'stop')
         self.assertIn('stopping', result.message)
 
+    def test_start_instances_batched(self):
+        """Test instances are started with a single API call classified by reported state"""
+        instances = [
+            EC2Resource(
+                instance_id=f'i-000000000000000{n}',
+                state='stopped',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStart': 'true'}
+            )
+            for n in range(3)
+        ]
+        instances.append(EC2Resource(
+            instance_id='i-0000000000000009',
+            state='running',
+            instance_type='t3.micro',
+            availability_zone='us-east-1a',
+            tags={'AutoStart': 'true'}
+        ))
+
+        self.ec2_manager.ec2_client.start_instances.return_value = {
+            'StartingInstances': [
+                {
+                    'InstanceId': f'i-000000000000000{n}',
+                    'CurrentState': {'Name': 'pending'},
+                    'PreviousState': {'Name': 'stopped'}
+                }
+                for n in range(3)
+            ] + [
+                {
+                    'InstanceId': 'i-0000000000000009',
+                    'CurrentState': {'Name': 'running'},
+                    'PreviousState': {'Name': 'running'}
+                }
+            ]
+        }
+
+        results = self.ec2_manager.start_instances(instances)
+
+        self.ec2_manager.ec2_client.start_instances.assert_called_once_with(
+            InstanceIds=[
+                'i-0000000000000000', 'i-0000000000000001', 'i-0000000000000002', 'i-0000000000000009'
+            ]
+        )
+        by_id = {r.instance_id: r for r in results}
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r.success for r in results))
+        self.assertIn('pending', by_id['i-0000000000000000'].message)
+        self.assertEqual(by_id['i-0000000000000009'].message, 'Instance already running')
+        self.assertEqual(len({r.timestamp for r in results}), 1)
+        self.assertEqual(results[0].timestamp.tzinfo, datetime.timezone.utc)
+
+    def test_start_instances_multiple_batches(self):
+        """Test large instance lists are split into concurrent API batches, keeping input order"""
+        instances = [
+            EC2Resource(
+                instance_id=f'i-{n:016x}',
+                state='stopped',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStart': 'true'}
+            )
+            for n in range(450)
+        ]
+        def start_instances(InstanceIds):
+            # Finish the first batch last so completion order differs from submit order
+            if InstanceIds[0] == instances[0].instance_id:
+                time.sleep(0.05)
+            return {
+                'StartingInstances': [
+                    {'InstanceId': instance_id, 'CurrentState': {'Name': 'pending'}}
+                    for instance_id in InstanceIds
+                ]
+            }
+        
+        self.ec2_manager.ec2_client.start_instances.side_effect = start_instances
+
+        results = self.ec2_manager.start_instances(instances)
+
+        batch_sizes = sorted(
+            len(call.kwargs['InstanceIds'])
+            for call in self.ec2_manager.ec2_client.start_instances.call_args_list
+        )
+        self.assertEqual(batch_sizes, [50, 200, 200])
+        self.assertEqual([r.instance_id for r in results], [i.instance_id for i in instances])
+        self.assertTrue(all(r.success for r in results))
+
+    def test_concurrent_batches_share_the_connection_pool(self):
+        """Test batches running concurrently split the pool for their per-instance fallbacks"""
+        instances = [
+            EC2Resource(
+                instance_id=f'i-{n:016x}',
+                state='stopped',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStart': 'true'}
+            )
+            for n in range(450)
+        ]
+        self.ec2_manager.ec2_client.start_instances.return_value = {'StartingInstances': []}
+        
+        with patch.object(self.ec2_manager, '_change_batch_state', return_value=[]) as mock_batch:
+            self.ec2_manager.start_instances(instances)
+        
+        self.assertEqual(
+            [call.args[2] for call in mock_batch.call_args_list],
+            [ec2_utils_improved.FALLBACK_THREADS_PER_BATCH] * 3
+        )
+        self.assertLessEqual(
+            ec2_utils_improved.MAX_CONCURRENT_BATCHES * ec2_utils_improved.FALLBACK_THREADS_PER_BATCH,
+            ec2_utils_improved._EC2_CLIENT_CONFIG.max_pool_connections
+        )
+    
+    def test_start_instances_accepts_generator(self):
+        """Test instances streamed from a generator are batched as they are consumed"""
+        instances = (
+            EC2Resource(
+                instance_id=f'i-{n:016x}',
+                state='stopped',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStart': 'true'}
+            )
+            for n in range(250)
+        )
+        self.ec2_manager.ec2_client.start_instances.side_effect = lambda InstanceIds: {
+            'StartingInstances': [
+                {'InstanceId': instance_id, 'CurrentState': {'Name': 'pending'}}
+                for instance_id in InstanceIds
+            ]
+        }
+
+        results = self.ec2_manager.start_instances(instances)
+
+        batch_sizes = sorted(
+            len(call.kwargs['InstanceIds'])
+            for call in self.ec2_manager.ec2_client.start_instances.call_args_list
+        )
+        self.assertEqual(batch_sizes, [50, 200])
+        self.assertEqual(len(results), 250)
+
+    def test_stop_instances_batch_error_falls_back_to_single_calls(self):
+        """Test a failed batch call is retried per instance"""
+        from botocore.exceptions import ClientError
+
+        instances = [
+            EC2Resource(
+                instance_id=f'i-000000000000000{n}',
+                state='running',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStop': 'true'}
+            )
+            for n in range(2)
+        ]
+        error = ClientError(
+            {'Error': {'Code': 'InvalidInstanceID.NotFound', 'Message': 'Not found'}},
+            'StopInstances'
+        )
+        self.ec2_manager.ec2_client.stop_instances.side_effect = [
+            error,
+            {'StoppingInstances': [{'InstanceId': 'i-0000000000000000', 'CurrentState': {'Name': 'stopping'}}]},
+            error
+        ]
+
+        results = self.ec2_manager.stop_instances(instances)
+
+        self.assertEqual(self.ec2_manager.ec2_client.stop_instances.call_count, 3)
+        self.assertEqual([r.success for r in results], [True, False])
+        self.assertEqual(results[1].error_code, 'InvalidInstanceID.NotFound')
+
+    def test_stop_instances_incorrect_state_refreshes_states(self):
+        """Test a batch rejected for instance state is retried with live states"""
+        from botocore.exceptions import ClientError
+
+        instances = [
+            EC2Resource(
+                instance_id=f'i-000000000000000{n}',
+                state='running',
+                instance_type='t3.micro',
+                availability_zone='us-east-1a',
+                tags={'AutoStop': 'true'}
+            )
+            for n in range(2)
+        ]
+        mock_paginator = Mock()
+        self.ec2_manager.ec2_client.get_paginator.return_value = mock_paginator
+        mock_paginator.paginate.return_value = [
+            {
+                'InstanceStatuses': [
+                    {'InstanceId': 'i-0000000000000000', 'InstanceState': {'Name': 'running'}},
+                    {'InstanceId': 'i-0000000000000001', 'InstanceState': {'Name': 'stopping'}}
+                ]
+            }
+        ]
+        self.ec2_manager.ec2_client.stop_instances.side_effect = [
+            ClientError(
+                {'Error': {'Code': 'IncorrectInstanceState', 'Message': 'Bad state'}},
+                'StopInstances'
+            ),
+            {'StoppingInstances': [{'InstanceId': 'i-0000000000000000', 'CurrentState': {'Name': 'stopping'}}]}
+        ]
+
+        results = self.ec2_manager.stop_instances(instances)
+
+        self.ec2_manager.ec2_client.get_paginator.assert_called_once_with('describe_instance_status')
+        self.assertEqual(self.ec2_manager.ec2_client.stop_instances.call_count, 2)
+        self.assertEqual([r.success for r in results], [True, False])
+        self.assertIn('current: stopping', results[1].message)
+        self.assertEqual(instances[1].state, 'running')
+
+
+class TestBackwardCompatibility(unittest.TestCase):
+    """Test the module-level functions kept for the original handlers"""
+    
+    @patch.object(boto3, 'client')
+    @patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True)
+    def test_process_time_based_instances_batches_calls(self, mock_boto_client):
+        """Test scheduled records are started in concurrent batches on the caller's client"""
+        ec2_client = Mock()
+        ec2_client.start_instances.side_effect = lambda InstanceIds: {
+            'StartingInstances': [
+                {'InstanceId': instance_id, 'CurrentState': {'Name': 'pending'}}
+                for instance_id in InstanceIds
+            ]
+        }
+        instances_data = [
+            {'instance_id': f'i-{n:016x}', 'scheduled_time': '09:00', 'current_state': 'stopped'}
+            for n in range(450)
+        ] + [{'instance_id': 'i-running', 'scheduled_time': '09:00', 'current_state': 'running'}]
+        
+        processed = process_time_based_instances(ec2_client, instances_data, 'stopped', 'start')
+        
+        self.assertEqual(processed, 450)
+        batches = [call.kwargs['InstanceIds'] for call in ec2_client.start_instances.call_args_list]
+        self.assertEqual(sorted(len(batch) for batch in batches), [50, 200, 200])
+        self.assertNotIn('i-running', [instance_id for batch in batches for instance_id in batch])
+        ec2_client.stop_instances.assert_not_called()
+    
+    def test_process_time_based_instances_nothing_eligible(self):
+        """Test no manager or API call is needed when no record is in the target state"""
+        ec2_client = Mock()
+        instances_data = [{'instance_id': 'i-1', 'scheduled_time': '18:00', 'current_state': 'stopped'}]
+        
+        with patch('ec2_utils_improved.EC2Manager') as mock_manager:
+            self.assertEqual(process_time_based_instances(ec2_client, instances_data, 'running', 'stop'), 0)
+        
+        mock_manager.assert_not_called()
+        ec2_client.stop_instances.assert_not_called()
+
+
+class TestSchedThreads(unittest.TestCase):
+    """Test parsing of the SCHED_THREADS environment variable"""
+    
+    def test_get_sched_threads(self):
+        """Test valid values are clamped to [1, max_threads]"""
+        cases = {'12': 12, ' 4 ': 4, '0': 1, '-3': 1, '80': 50, '': DEFAULT_SCHED_THREADS}
+        for value, expected in cases.items():
+            with self.subTest(value=value), patch.dict(os.environ, {'SCHED_THREADS': value}):
+                self.assertEqual(get_sched_threads(50), expected)
+        
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(get_sched_threads(50), DEFAULT_SCHED_THREADS)
+    
+    def test_get_sched_threads_invalid_value(self):
+        """Test a non-integer value falls back to the default instead of failing init"""
+        for value in ['eight', '2.5']:
+            with self.subTest(value=value), patch.dict(os.environ, {'SCHED_THREADS': value}), \
+                    self.assertLogs(level='WARNING'):
+                self.assertEqual(get_sched_threads(50), DEFAULT_SCHED_THREADS)
+
 
 class TestLambdaResponse(unittest.TestCase):
     """Test Lambda response creation"""
@@ -400,50 +882,42 @@ class TestLambdaResponse(unittest.TestCase):
         self.assertEqual(body['summary']['successful'], 1)
         self.assertEqual(body['summary']['failed'], 1)
 
+    def test_configure_logging_is_idempotent(self):
+        """Test repeated configure_logging calls reuse the installed handler"""
+        logger = configure_logging()
+        handlers = list(logger.handlers)
+
+        self.assertIs(configure_logging(), logger)
+        self.assertEqual(logger.handlers, handlers)
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for EC2 utilities"""
     
-    @patch('boto3.client')
-    @patch('boto3.resource')
-    def test_full_workflow_start_instances(self, mock_resource, mock_client):
-        """Test full workflow for starting instances"""
-        # Mock EC2 client
-        mock_ec2_client = Mock()
-        mock_client.return_value = mock_ec2_client
-        
-        # Mock paginator for describe_instances
-        mock_paginator = Mock()
-        mock_ec2_client.get_paginator.return_value = mock_paginator
-        
-        mock_paginator.paginate.return_value = [
-            {
-                'Reservations': [
-                    {
-                        'Instances': [
-                            {
-                                'InstanceId': 'i-1234567890abcdef0',
-                                'State': {'Name': 'stopped'},
-                                'InstanceType': 't3.micro',
-                                'Placement': {'AvailabilityZone': 'us-east-1a'},
-                                'Tags': [{'Key': 'AutoStart', 'Value': 'true'}]
-                            }
-                        ]
-                    }
-                ]
-            }
-        ]
-        
-        # Mock start_instances response
-        mock_ec2_client.start_instances.return_value = {
-            'StartingInstances': [
-                {
-                    'InstanceId': 'i-1234567890abcdef0',
-                    'CurrentState': {'Name': 'pending'},
-                    'PreviousState': {'Name': 'stopped'}
-                }
-            ]
-        }
+    @mock_ec2
+    @patch.dict(os.environ, {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1'
+    })
+    @patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True)
+    def test_full_workflow_start_instances(self):
+        """Test full workflow for starting instances against a moto EC2 backend"""
+        ec2 = boto3.client('ec2', region_name='us-east-1')
+        image_id = ec2.describe_images(Owners=['amazon'])['Images'][0]['ImageId']
+        
+        # One tagged instance to start and one untagged instance that must be left alone
+        tagged_id = ec2.run_instances(
+            ImageId=image_id, MinCount=1, MaxCount=1,
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'AutoStart', 'Value': 'true'}]
+            }]
+        )['Instances'][0]['InstanceId']
+        untagged_id = ec2.run_instances(
+            ImageId=image_id, MinCount=1, MaxCount=1
+        )['Instances'][0]['InstanceId']
+        ec2.stop_instances(InstanceIds=[tagged_id, untagged_id])
         
         # Create EC2Manager and test workflow
         ec2_manager = EC2Manager('us-east-1')
@@ -455,7 +929,7 @@ class TestIntegration(unittest.TestCase):
             instance_states=['stopped']
         )
         
-        self.assertEqual(len(instances), 1)
+        self.assertEqual([i.instance_id for i in instances], [tagged_id])
         
         # Start instances
         results = ec2_manager.start_instances(instances)
@@ -463,19 +937,24 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertTrue(results[0].success)
         
-        # Verify start_instances was called
-        mock_ec2_client.start_instances.assert_called_once_with(
-            InstanceIds=['i-1234567890abcdef0']
-        )
+        # Verify only the tagged instance left the stopped state
+        states = ec2_manager.get_states([tagged_id, untagged_id])
+        self.assertIn(states[tagged_id], ('pending', 'running'))
+        self.assertEqual(states[untagged_id], 'stopped')
 
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling scenarios"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build one manager around a mocked client for the whole class"""
+        with patch.object(boto3, 'client'), patch.dict('ec2_utils_improved._CLIENT_CACHE', clear=True):
+            cls.ec2_manager = EC2Manager('us-east-1')
+    
     def setUp(self):
-        """Set up test environment"""
-        with patch('boto3.client'), patch('boto3.resource'):
-            self.ec2_manager = EC2Manager('us-east-1')
+        """Clear calls and canned responses left on the shared client by earlier tests"""
+        self.ec2_manager.ec2_client.reset_mock(return_value=True, side_effect=True)
     
     def test_client_error_handling(self):
         """Test handling of AWS ClientError"""
@@ -506,11 +985,20 @@ class TestErrorHandling(unittest.TestCase):
         self.assertEqual(result.error_code, 'InvalidInstanceID.NotFound')
         self.assertIn('does not exist', result.message)
 
+    def test_warm_connection_swallows_errors(self):
+        """Test connection warm-up never raises during Lambda init"""
+        self.ec2_manager.ec2_client.describe_instances.side_effect = Exception('endpoint unreachable')
+
+        self.ec2_manager.warm_connection()
+
+        self.ec2_manager.ec2_client.describe_instances.assert_called_once()
+
 
 if __name__ == '__main__':
-    # Configure logging for tests
-    import logging
-    logging.basicConfig(level=logging.DEBUG)
-    
-    # Run tests
-    unittest.main(verbosity=2)
+    # Test classes share no state, so run them across all cores when pytest-xdist is installed
+    import importlib.util
+    import pytest
+    args = [__file__, '-v']
+    if importlib.util.find_spec('xdist') is not None:
+        args += ['-n', 'auto']
+    sys.exit(pytest.main(args))
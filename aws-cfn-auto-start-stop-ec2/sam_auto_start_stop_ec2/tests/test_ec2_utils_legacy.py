@@ -0,0 +1,284 @@
+"""
+Test Suite for the Legacy EC2 Utilities
+
+Covers the ec2_utils module used by the original (non-improved) Lambda handlers:
+time-tag schedule caching, window matching and batched start/stop calls.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import datetime
+import os
+import sys
+
+# Add the lambda layer to the path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_layer', 'python'))
+
+import ec2_utils
+
+
+def _describe_page(*instances):
+    """Build a single DescribeInstances page from (instance_id, state, tags) tuples"""
+    return {
+        'Reservations': [{
+            'Instances': [
+                {
+                    'InstanceId': instance_id,
+                    'State': {'Name': state},
+                    'Tags': [{'Key': key, 'Value': value} for key, value in tags.items()]
+                }
+                for instance_id, state, tags in instances
+            ]
+        }]
+    }
+
+
+@patch.dict('ec2_utils._DESCRIBE_CACHE', clear=True)
+class TestTimeTagScheduleCache(unittest.TestCase):
+    """Test caching of time-tag schedules across warm invocations"""
+
+    # Monday 09:00
+    NOW = datetime.datetime(2024, 1, 1, 9, 0)
+
+    def setUp(self):
+        self.ec2_client = Mock()
+        self.live_state = 'stopped'
+
+        def describe_instances(**kwargs):
+            # Fleet scans carry Filters; live state reads carry InstanceIds only
+            return _describe_page(('i-1', self.live_state, {'StartWeekDay': '09:00'}))
+
+        self.ec2_client.describe_instances.side_effect = describe_instances
+
+    def _get_matching(self):
+        return ec2_utils.get_instances_by_time_tag(self.ec2_client, 'StartWeekDay', self.NOW)
+
+    @patch('ec2_utils.time.monotonic', return_value=1000.0)
+    def test_cache_hit_reads_live_state(self, mock_monotonic):
+        """A cached schedule must not reuse the state seen when it was cached"""
+        first = self._get_matching()
+        self.assertEqual(first[0]['current_state'], 'stopped')
+
+        # The instance was started by someone else since the scan
+        self.live_state = 'running'
+        mock_monotonic.return_value = 1000.0 + ec2_utils.DESCRIBE_CACHE_TTL - 1
+        second = self._get_matching()
+
+        self.assertEqual(second[0]['current_state'], 'running')
+        last_call = self.ec2_client.describe_instances.call_args
+        self.assertEqual(last_call.kwargs, {'InstanceIds': ['i-1']})
+
+        # So the scheduled start does not act on it
+        self.assertEqual(ec2_utils.process_time_based_instances(self.ec2_client, second, 'stopped', 'start'), 0)
+        self.ec2_client.start_instances.assert_not_called()
+
+    @patch('ec2_utils.time.monotonic', return_value=1000.0)
+    def test_cache_expires_after_ttl(self, mock_monotonic):
+        """After the TTL the fleet is scanned again instead of reusing the schedule"""
+        self._get_matching()
+        mock_monotonic.return_value = 1000.0 + ec2_utils.DESCRIBE_CACHE_TTL
+        self._get_matching()
+
+        self.assertEqual(self.ec2_client.describe_instances.call_count, 2)
+        for call in self.ec2_client.describe_instances.call_args_list:
+            self.assertIn('Filters', call.kwargs)
+
+    @patch('ec2_utils.DESCRIBE_CACHE_TTL', 0)
+    def test_cache_disabled(self):
+        """A TTL of 0 never stores a schedule"""
+        self._get_matching()
+        self._get_matching()
+
+        self.assertEqual(ec2_utils._DESCRIBE_CACHE, {})
+        self.assertEqual(self.ec2_client.describe_instances.call_count, 2)
+
+    def test_terminated_cached_instance_rescans(self):
+        """A cached instance that no longer exists falls back to a fresh fleet scan"""
+        from botocore.exceptions import ClientError
+
+        self._get_matching()
+        not_found = ClientError({'Error': {'Code': 'InvalidInstanceID.NotFound'}}, 'DescribeInstances')
+        self.ec2_client.describe_instances.side_effect = [not_found, _describe_page()]
+
+        self.assertEqual(self._get_matching(), [])
+        self.assertEqual(ec2_utils._DESCRIBE_CACHE['StartWeekDay'][1], {})
+        self.assertIn('Filters', self.ec2_client.describe_instances.call_args.kwargs)
+
+
+
+@patch.dict('ec2_utils._DESCRIBE_CACHE', clear=True)
+class TestTimeWindow(unittest.TestCase):
+    """Test minutes-of-day parsing and schedule window matching"""
+
+    def test_minutes_of_day(self):
+        """Tag values parse into minutes since midnight"""
+        self.assertEqual(ec2_utils._minutes_of_day('00:00'), 0)
+        self.assertEqual(ec2_utils._minutes_of_day('09:05'), 545)
+        self.assertEqual(ec2_utils._minutes_of_day('23:59'), 1439)
+
+        for time_str in ['24:00', '12:60', '-1:30', 'invalid', '', '1:2:3', None]:
+            with self.subTest(time=time_str):
+                self.assertIsNone(ec2_utils._minutes_of_day(time_str))
+
+    def test_in_time_window(self):
+        """Window bounds are inclusive, with and without a midnight wrap"""
+        # 08:55 - 09:05
+        self.assertTrue(ec2_utils._in_time_window(535, 535, 545))
+        self.assertTrue(ec2_utils._in_time_window(545, 535, 545))
+        self.assertFalse(ec2_utils._in_time_window(534, 535, 545))
+        self.assertFalse(ec2_utils._in_time_window(546, 535, 545))
+
+        # 23:53 - 00:03
+        for minutes in (1433, 1439, 0, 3):
+            with self.subTest(minutes=minutes):
+                self.assertTrue(ec2_utils._in_time_window(minutes, 1433, 3))
+        for minutes in (1432, 4, 720):
+            with self.subTest(minutes=minutes):
+                self.assertFalse(ec2_utils._in_time_window(minutes, 1433, 3))
+
+    def _matching_ids(self, current_time, *values):
+        ec2_client = Mock()
+        ec2_client.describe_instances.return_value = _describe_page(*(
+            (f'i-{value.replace(":", "")}', 'running', {'StopWeekDay': value}) for value in values
+        ))
+        instances = ec2_utils.get_instances_by_time_tag(
+            ec2_client, 'StopWeekDay', current_time, time_window_minutes=5
+        )
+        return [instance['instance_id'] for instance in instances]
+
+    def test_window_wraps_midnight(self):
+        """At 23:58 the window 23:53 - 00:03 matches schedules on both sides of midnight"""
+        matching = self._matching_ids(
+            datetime.datetime(2024, 1, 1, 23, 58), '23:53', '00:02', '00:03', '00:04', '23:52'
+        )
+
+        self.assertEqual(matching, ['i-2353', 'i-0002', 'i-0003'])
+
+    def test_window_edges(self):
+        """At 09:00 the window includes 08:55 and 09:05 and nothing beyond"""
+        matching = self._matching_ids(
+            datetime.datetime(2024, 1, 1, 9, 0), '08:54', '08:55', '09:00', '09:05', '09:06'
+        )
+
+        self.assertEqual(matching, ['i-0855', 'i-0900', 'i-0905'])
+
+
+
+def _scheduled(instance_ids, state):
+    """Build get_instances_by_time_tag-style records for the given instance IDs"""
+    return [
+        {'instance_id': instance_id, 'scheduled_time': '09:00', 'current_state': state}
+        for instance_id in instance_ids
+    ]
+
+
+class TestBatchedStateChanges(unittest.TestCase):
+    """Test batching of scheduled start/stop calls"""
+
+    def setUp(self):
+        self.ec2_client = Mock()
+        self.instance_ids = [f'i-{n:05d}' for n in range(450)]
+
+    def test_batch_instance_ids(self):
+        """IDs are grouped into batches of at most INSTANCE_BATCH_SIZE"""
+        batches = list(ec2_utils.batch_instance_ids(iter(self.instance_ids)))
+
+        self.assertEqual(ec2_utils.INSTANCE_BATCH_SIZE, 200)
+        self.assertEqual([len(batch) for batch in batches], [200, 200, 50])
+        self.assertEqual([i for batch in batches for i in batch], self.instance_ids)
+        self.assertEqual(list(ec2_utils.batch_instance_ids([])), [])
+
+    def test_start_issues_one_call_per_batch(self):
+        """Scheduled starts are sent as one StartInstances call per 200 IDs"""
+        processed = ec2_utils.process_time_based_instances(
+            self.ec2_client, _scheduled(self.instance_ids, 'stopped'), 'stopped', 'start'
+        )
+
+        self.assertEqual(processed, 450)
+        calls = self.ec2_client.start_instances.call_args_list
+        self.assertEqual([call.kwargs['InstanceIds'] for call in calls], [
+            self.instance_ids[:200], self.instance_ids[200:400], self.instance_ids[400:]
+        ])
+        self.ec2_client.stop_instances.assert_not_called()
+
+    def test_stop_skips_instances_in_other_states(self):
+        """Only instances in the target state are batched into StopInstances calls"""
+        instances = _scheduled(self.instance_ids[:3], 'running') + _scheduled(['i-stopped'], 'stopped')
+
+        processed = ec2_utils.process_time_based_instances(self.ec2_client, instances, 'running', 'stop')
+
+        self.assertEqual(processed, 3)
+        self.ec2_client.stop_instances.assert_called_once_with(InstanceIds=self.instance_ids[:3])
+        self.ec2_client.start_instances.assert_not_called()
+
+    def test_throttled_batch_is_retried_per_instance(self):
+        """A throttled batch is not dropped; its instances are retried one by one"""
+        from botocore.exceptions import ClientError
+
+        throttled = ClientError({'Error': {'Code': 'RequestLimitExceeded'}}, 'StartInstances')
+        batch = self.instance_ids[:3]
+        self.ec2_client.start_instances.side_effect = [throttled, None, None, None]
+
+        processed = ec2_utils.process_time_based_instances(
+            self.ec2_client, _scheduled(batch, 'stopped'), 'stopped', 'start'
+        )
+
+        self.assertEqual(processed, 3)
+        retried = sorted(call.kwargs['InstanceIds'][0] for call in self.ec2_client.start_instances.call_args_list[1:])
+        self.assertEqual(retried, batch)
+
+    def test_failed_batch_isolates_bad_instance(self):
+        """When a batch call fails, each instance is retried and only the bad one is lost"""
+        from botocore.exceptions import ClientError
+
+        batch = self.instance_ids[:3]
+        bad_id = batch[1]
+
+        def start_instances(InstanceIds):
+            if len(InstanceIds) > 1 or InstanceIds == [bad_id]:
+                raise ClientError({'Error': {'Code': 'InvalidInstanceID.NotFound'}}, 'StartInstances')
+
+        self.ec2_client.start_instances.side_effect = start_instances
+
+        with self.assertLogs(level='ERROR') as logs:
+            processed = ec2_utils.process_time_based_instances(
+                self.ec2_client, _scheduled(batch, 'stopped'), 'stopped', 'start'
+            )
+
+        self.assertEqual(processed, 2)
+        calls = [call.kwargs['InstanceIds'] for call in self.ec2_client.start_instances.call_args_list]
+        self.assertEqual(calls[0], batch)
+        self.assertEqual(sorted(calls[1:]), [[instance_id] for instance_id in batch])
+        self.assertTrue(any(bad_id in line and 'Error starting instance ' in line for line in logs.output))
+
+    def test_change_single_state(self):
+        """The per-instance helper reports success and swallows failures"""
+        change_state = Mock()
+        self.assertTrue(ec2_utils._change_single_state(change_state, 'stop', 'Stopped', 'i-1', '18:00'))
+        change_state.assert_called_once_with(InstanceIds=['i-1'])
+
+        change_state.side_effect = Exception('boom')
+        with self.assertLogs(level='ERROR'):
+            self.assertFalse(ec2_utils._change_single_state(change_state, 'stop', 'Stopped', 'i-1', '18:00'))
+
+    def test_sched_threads_parsed_defensively(self):
+        """A bad SCHED_THREADS value neither fails the import nor disables the fallback pool"""
+        import importlib.util
+
+        for value, expected in (('eight', 8), ('0', 1), ('-2', 1), ('500', 50)):
+            with self.subTest(value=value), patch.dict(os.environ, {'SCHED_THREADS': value}):
+                # Load a separate copy so the shared module's state is untouched
+                spec = importlib.util.spec_from_file_location('ec2_utils_sched_threads', ec2_utils.__file__)
+                module = importlib.util.module_from_spec(spec)
+                with self.assertNoLogs(level='ERROR'):
+                    spec.loader.exec_module(module)
+                self.assertEqual(module.MAX_CONCURRENT_CALLS, expected)
+
+    def test_empty_input(self):
+        """No records means no API calls"""
+        self.assertEqual(ec2_utils.process_time_based_instances(self.ec2_client, [], 'stopped', 'start'), 0)
+        self.ec2_client.start_instances.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
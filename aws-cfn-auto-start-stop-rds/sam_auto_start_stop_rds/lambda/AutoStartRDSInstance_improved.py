@@ -10,8 +10,13 @@ Version: 2.0.0
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from typing import Dict, Any, List
-from rds_utils import RDSManager, TagProcessor, create_lambda_response
+from rds_utils import AURORA_ENGINES, RDSManager, TagProcessor, create_lambda_response
+
+# Upper bound on concurrent start calls, kept low to stay under RDS API throttling limits
+MAX_START_WORKERS = 16
 
 
 def setup_logging() -> logging.Logger:
@@ -34,6 +39,10 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+# Configure logging once per execution environment rather than on every invocation
+logger = setup_logging()
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for auto-starting RDS instances and clusters.
@@ -45,7 +54,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response dictionary
     """
-    logger = setup_logging()
     logger.info("Starting Auto Start RDS Instance function")
     
     try:
@@ -54,41 +62,33 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         tag_processor = TagProcessor()
         
         # Get all RDS resources
-        instances, clusters = rds_manager.get_all_rds_resources()
-        all_resources = instances + clusters
+        instances, clusters = rds_manager.get_all_rds_resources(tag_key='AutoStart')
+        total_resources = len(instances) + len(clusters)
         
-        if not all_resources:
+        if not total_resources:
             message = "No RDS resources found in the region"
             logger.info(message)
             return create_lambda_response(True, message)
         
         # Get all read replicas to exclude them from operations
-        all_read_replicas = rds_manager.get_all_read_replicas(all_resources)
-        logger.info(f"Found {len(all_read_replicas)} read replicas to exclude")
+        all_read_replicas = rds_manager.get_all_read_replicas(chain(instances, clusters))
+        logger.info("Found %s read replicas to exclude", len(all_read_replicas))
         
         # Process each resource
         started_resources = []
         skipped_resources = []
         error_resources = []
+        to_start = []
         
-        for resource in all_resources:
+        for resource in chain(instances, clusters):
             try:
-                logger.info(f"Processing {resource.identifier} (engine: {resource.engine}, status: {resource.status})")
-                
-                # Skip read replicas
-                if rds_manager.is_read_replica(resource, all_read_replicas):
-                    logger.info(f"Skipping read replica: {resource.identifier}")
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': 'Read replica - cannot be started independently'
-                    })
-                    continue
+                logger.info("Processing %s (engine: %s, status: %s)", resource.identifier, resource.engine, resource.status)
                 
                 # Check for AutoStart tag
                 auto_start = tag_processor.get_boolean_tag_value(resource.tags, 'AutoStart')
                 
                 if auto_start is None:
-                    logger.info(f"AutoStart tag not found or invalid for {resource.identifier}")
+                    logger.info("AutoStart tag not found or invalid for %s", resource.identifier)
                     skipped_resources.append({
                         'identifier': resource.identifier,
                         'reason': 'AutoStart tag not set or invalid'
@@ -96,55 +96,80 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     continue
                 
                 if not auto_start:
-                    logger.info(f"AutoStart disabled for {resource.identifier}")
+                    logger.info("AutoStart disabled for %s", resource.identifier)
                     skipped_resources.append({
                         'identifier': resource.identifier,
                         'reason': 'AutoStart tag set to false'
                     })
                     continue
                 
-                # Validate engine compatibility
-                if resource.is_cluster and not rds_manager.is_aurora_engine(resource.engine):
-                    logger.warning(f"Non-Aurora engine in cluster format: {resource.identifier}")
+                # Skip read replicas
+                if resource.identifier in all_read_replicas or resource.read_replicas:
+                    logger.info("Skipping read replica: %s", resource.identifier)
                     skipped_resources.append({
                         'identifier': resource.identifier,
-                        'reason': 'Non-Aurora engine in cluster format'
+                        'reason': 'Read replica - cannot be started independently'
                     })
                     continue
                 
-                if not resource.is_cluster and rds_manager.is_aurora_engine(resource.engine):
-                    logger.warning(f"Aurora engine in instance format: {resource.identifier}")
+                # Validate engine compatibility
+                is_aurora = resource.engine in AURORA_ENGINES
+                
+                if resource.is_cluster and not is_aurora:
+                    logger.warning("Non-Aurora engine in cluster format: %s", resource.identifier)
                     skipped_resources.append({
                         'identifier': resource.identifier,
-                        'reason': 'Aurora engine should be managed as cluster'
+                        'reason': 'Non-Aurora engine in cluster format'
                     })
                     continue
                 
-                # Attempt to start the resource
-                if rds_manager.start_rds_resource(resource):
-                    started_resources.append({
-                        'identifier': resource.identifier,
-                        'type': 'cluster' if resource.is_cluster else 'instance',
-                        'engine': resource.engine
-                    })
-                else:
+                if not resource.is_cluster and is_aurora:
+                    logger.warning("Aurora engine in instance format: %s", resource.identifier)
                     skipped_resources.append({
                         'identifier': resource.identifier,
-                        'reason': f'Not in stopped state (current: {resource.status})'
+                        'reason': 'Aurora engine should be managed as cluster'
                     })
+                    continue
+                
+                to_start.append(resource)
                     
             except Exception as e:
-                logger.error(f"Error processing resource {resource.identifier}: {e}")
+                logger.error("Error processing resource %s: %s", resource.identifier, e)
                 error_resources.append({
                     'identifier': resource.identifier,
                     'error': str(e)
                 })
         
+        # Start the eligible resources concurrently; each call is I/O-bound on the RDS API
+        if to_start:
+            with ThreadPoolExecutor(max_workers=min(MAX_START_WORKERS, len(to_start))) as executor:
+                futures = {executor.submit(rds_manager.start_rds_resource, r): r for r in to_start}
+                for future in as_completed(futures):
+                    resource = futures[future]
+                    try:
+                        if future.result():
+                            started_resources.append({
+                                'identifier': resource.identifier,
+                                'type': 'cluster' if resource.is_cluster else 'instance',
+                                'engine': resource.engine
+                            })
+                        else:
+                            skipped_resources.append({
+                                'identifier': resource.identifier,
+                                'reason': f'Not in stopped state (current: {resource.status})'
+                            })
+                    except Exception as e:
+                        logger.error("Error starting resource %s: %s", resource.identifier, e)
+                        error_resources.append({
+                            'identifier': resource.identifier,
+                            'error': str(e)
+                        })
+        
         # Prepare response
         total_processed = len(started_resources) + len(skipped_resources) + len(error_resources)
         
         response_details = {
-            'total_resources_found': len(all_resources),
+            'total_resources_found': total_resources,
             'total_processed': total_processed,
             'started_count': len(started_resources),
             'skipped_count': len(skipped_resources),
@@ -158,7 +183,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         message = f"Auto start completed. Started: {len(started_resources)}, Skipped: {len(skipped_resources)}, Errors: {len(error_resources)}"
         
         logger.info(message)
-        logger.info(f"Started resources: {[r['identifier'] for r in started_resources]}")
+        logger.info("Started resources: %s", [r['identifier'] for r in started_resources])
         
         return create_lambda_response(success, message, response_details)
         
@@ -34,6 +34,10 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+# Configure logging once per execution environment rather than on every invocation
+logger = setup_logging()
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for auto-stopping RDS instances and clusters.
@@ -45,7 +49,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response dictionary
     """
-    logger = setup_logging()
     logger.info("Starting Auto Stop RDS Instance function")
     
     try:
@@ -54,7 +57,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         tag_processor = TagProcessor()
         
         # Get all RDS resources
-        instances, clusters = rds_manager.get_all_rds_resources()
+        instances, clusters = rds_manager.get_all_rds_resources(tag_key='AutoStop')
         all_resources = instances + clusters
         
         if not all_resources:
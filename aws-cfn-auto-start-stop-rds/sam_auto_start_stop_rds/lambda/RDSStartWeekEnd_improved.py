@@ -8,6 +8,7 @@ Author: Improved by AI Assistant
 Version: 2.0.0
 """
 
+import datetime
 import json
 import logging
 from typing import Dict, Any, List
@@ -34,6 +35,10 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+# Configure logging once per execution environment rather than on every invocation
+logger = setup_logging()
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for starting RDS resources on weekends based on schedule.
@@ -45,7 +50,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response dictionary
     """
-    logger = setup_logging()
     logger.info("Starting RDS Start WeekEnd function")
     
     try:
@@ -58,14 +62,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         timezone = tz_manager.set_timezone()
         logger.info(f"Operating in timezone: {timezone}")
         
+        # Read the clock once so the day check and every resource use the same time
+        now = datetime.datetime.now()
+        
         # Check if today is a weekend
-        if not tz_manager.is_weekend():
+        if not tz_manager.is_weekend(now):
             message = "Today is not a weekend, skipping execution"
             logger.info(message)
             return create_lambda_response(True, message, {'is_weekend': False})
         
         # Get all RDS resources
-        instances, clusters = rds_manager.get_all_rds_resources()
+        instances, clusters = rds_manager.get_all_rds_resources(tag_key='StartWeekEnd')
         all_resources = instances + clusters
         
         if not all_resources:
@@ -107,7 +114,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     continue
                 
                 # Check if current time matches the scheduled time
-                if not tz_manager.is_time_in_range(start_time):
+                if not tz_manager.is_time_in_range(start_time, now=now):
                     logger.debug(f"Not time to start {resource.identifier} (scheduled: {start_time})")
                     skipped_resources.append({
                         'identifier': resource.identifier,
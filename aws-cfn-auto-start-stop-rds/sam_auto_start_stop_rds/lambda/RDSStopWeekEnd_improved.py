@@ -8,10 +8,15 @@ Author: Improved by AI Assistant
 Version: 2.0.0
 """
 
+import datetime
 import json
 import logging
-from typing import Dict, Any, List
-from rds_utils import RDSManager, TagProcessor, TimeZoneManager, create_lambda_response
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Set, Tuple
+from rds_utils import RDSManager, RDSResource, TagProcessor, TimeZoneManager, create_lambda_response
+
+# Upper bound on concurrent stop calls, kept low to stay under RDS API throttling limits
+MAX_STOP_WORKERS = 8
 
 
 def setup_logging() -> logging.Logger:
@@ -34,6 +39,65 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+# Configure logging once per execution environment rather than on every invocation
+logger = setup_logging()
+
+
+def classify_resource(
+    resource: RDSResource,
+    rds_manager: RDSManager,
+    tag_processor: TagProcessor,
+    tz_manager: TimeZoneManager,
+    all_read_replicas: Set[str],
+    now: datetime.datetime
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decide whether a resource is due to be stopped now, without calling the stop API.
+    
+    Args:
+        resource: RDS resource to check
+        rds_manager: RDS manager used for engine and replica checks
+        tag_processor: Tag processor used to read the StopWeekEnd tag
+        tz_manager: Timezone manager used for the schedule window check
+        all_read_replicas: Identifiers of all read replicas
+        now: Current time shared by every resource in the invocation
+        
+    Returns:
+        (scheduled stop time, None) if the resource should be stopped, otherwise (None, skip reason)
+    """
+    logger.info(f"Processing {resource.identifier} (engine: {resource.engine}, status: {resource.status})")
+    
+    # Skip read replicas
+    if rds_manager.is_read_replica(resource, all_read_replicas):
+        logger.info(f"Skipping read replica: {resource.identifier}")
+        return None, 'Read replica - cannot be stopped independently'
+    
+    # Check for StopWeekEnd tag
+    stop_time = tag_processor.get_time_tag_value(resource.tags, 'StopWeekEnd')
+    
+    if stop_time is None:
+        logger.debug(f"StopWeekEnd tag not found or invalid for {resource.identifier}")
+        return None, 'StopWeekEnd tag not set or invalid format'
+    
+    # Check if current time matches the scheduled time
+    if not tz_manager.is_time_in_range(stop_time, now=now):
+        logger.debug(f"Not time to stop {resource.identifier} (scheduled: {stop_time})")
+        return None, f'Not scheduled time (scheduled: {stop_time})'
+    
+    logger.info(f"Time to stop {resource.identifier} (scheduled: {stop_time})")
+    
+    # Validate engine compatibility
+    if resource.is_cluster and not rds_manager.is_aurora_engine(resource.engine):
+        logger.warning(f"Non-Aurora engine in cluster format: {resource.identifier}")
+        return None, 'Non-Aurora engine in cluster format'
+    
+    if not resource.is_cluster and rds_manager.is_aurora_engine(resource.engine):
+        logger.warning(f"Aurora engine in instance format: {resource.identifier}")
+        return None, 'Aurora engine should be managed as cluster'
+    
+    return stop_time, None
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for stopping RDS resources on weekends based on schedule.
@@ -45,7 +109,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standardized response dictionary
     """
-    logger = setup_logging()
     logger.info("Starting RDS Stop WeekEnd function")
     
     try:
@@ -58,14 +121,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         timezone = tz_manager.set_timezone()
         logger.info(f"Operating in timezone: {timezone}")
         
+        # Read the clock once so the day check and every resource use the same time
+        now = datetime.datetime.now()
+        
         # Check if today is a weekend
-        if not tz_manager.is_weekend():
+        if not tz_manager.is_weekend(now):
             message = "Today is not a weekend, skipping execution"
             logger.info(message)
             return create_lambda_response(True, message, {'is_weekend': False})
         
         # Get all RDS resources
-        instances, clusters = rds_manager.get_all_rds_resources()
+        instances, clusters = rds_manager.get_all_rds_resources(tag_key='StopWeekEnd')
         all_resources = instances + clusters
         
         if not all_resources:
@@ -81,72 +147,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         stopped_resources = []
         skipped_resources = []
         error_resources = []
+        to_stop = []
         
         for resource in all_resources:
             try:
-                logger.info(f"Processing {resource.identifier} (engine: {resource.engine}, status: {resource.status})")
-                
-                # Skip read replicas
-                if rds_manager.is_read_replica(resource, all_read_replicas):
-                    logger.info(f"Skipping read replica: {resource.identifier}")
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': 'Read replica - cannot be stopped independently'
-                    })
-                    continue
-                
-                # Check for StopWeekEnd tag
-                stop_time = tag_processor.get_time_tag_value(resource.tags, 'StopWeekEnd')
-                
-                if stop_time is None:
-                    logger.debug(f"StopWeekEnd tag not found or invalid for {resource.identifier}")
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': 'StopWeekEnd tag not set or invalid format'
-                    })
-                    continue
-                
-                # Check if current time matches the scheduled time
-                if not tz_manager.is_time_in_range(stop_time):
-                    logger.debug(f"Not time to stop {resource.identifier} (scheduled: {stop_time})")
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': f'Not scheduled time (scheduled: {stop_time})'
-                    })
-                    continue
-                
-                logger.info(f"Time to stop {resource.identifier} (scheduled: {stop_time})")
-                
-                # Validate engine compatibility
-                if resource.is_cluster and not rds_manager.is_aurora_engine(resource.engine):
-                    logger.warning(f"Non-Aurora engine in cluster format: {resource.identifier}")
+                stop_time, skip_reason = classify_resource(
+                    resource, rds_manager, tag_processor, tz_manager, all_read_replicas, now
+                )
+                if skip_reason is not None:
                     skipped_resources.append({
                         'identifier': resource.identifier,
-                        'reason': 'Non-Aurora engine in cluster format'
-                    })
-                    continue
-                
-                if not resource.is_cluster and rds_manager.is_aurora_engine(resource.engine):
-                    logger.warning(f"Aurora engine in instance format: {resource.identifier}")
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': 'Aurora engine should be managed as cluster'
-                    })
-                    continue
-                
-                # Attempt to stop the resource
-                if rds_manager.stop_rds_resource(resource):
-                    stopped_resources.append({
-                        'identifier': resource.identifier,
-                        'type': 'cluster' if resource.is_cluster else 'instance',
-                        'engine': resource.engine,
-                        'scheduled_time': stop_time
+                        'reason': skip_reason
                     })
                 else:
-                    skipped_resources.append({
-                        'identifier': resource.identifier,
-                        'reason': f'Not in available state (current: {resource.status})'
-                    })
+                    to_stop.append((resource, stop_time))
                     
             except Exception as e:
                 logger.error(f"Error processing resource {resource.identifier}: {e}")
@@ -155,6 +169,35 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'error': str(e)
                 })
         
+        # Stop the scheduled resources concurrently; each call is I/O-bound on the RDS API
+        if to_stop:
+            with ThreadPoolExecutor(max_workers=min(MAX_STOP_WORKERS, len(to_stop))) as executor:
+                futures = {
+                    executor.submit(rds_manager.stop_rds_resource, resource): (resource, stop_time)
+                    for resource, stop_time in to_stop
+                }
+                for future in as_completed(futures):
+                    resource, stop_time = futures[future]
+                    try:
+                        if future.result():
+                            stopped_resources.append({
+                                'identifier': resource.identifier,
+                                'type': 'cluster' if resource.is_cluster else 'instance',
+                                'engine': resource.engine,
+                                'scheduled_time': stop_time
+                            })
+                        else:
+                            skipped_resources.append({
+                                'identifier': resource.identifier,
+                                'reason': f'Not in available state (current: {resource.status})'
+                            })
+                    except Exception as e:
+                        logger.error(f"Error stopping resource {resource.identifier}: {e}")
+                        error_resources.append({
+                            'identifier': resource.identifier,
+                            'error': str(e)
+                        })
+        
         # Prepare response
         total_processed = len(stopped_resources) + len(skipped_resources) + len(error_resources)
         
@@ -9,15 +9,82 @@ Version: 2.0.0
 """
 
 import boto3
+import functools
 import logging
 import os
 import time
 import datetime
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Iterable, List, Dict, Optional, Set, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 
+# Describe page size: the MaxRecords ceiling for DescribeDBInstances and DescribeDBClusters
+DESCRIBE_PAGE_SIZE = 100
+
+# Fields read from each described instance/cluster; everything else is dropped page by page
+_INSTANCE_FIELDS = (
+    'DBInstanceIdentifier', 'DBInstanceArn', 'Engine', 'DBInstanceStatus', 'ReadReplicaDBInstanceIdentifiers'
+)
+_CLUSTER_FIELDS = ('DBClusterIdentifier', 'DBClusterArn', 'Engine', 'Status', 'ReadReplicaIdentifiers')
+
+# Upper bound on concurrent ListTagsForResource calls in get_all_rds_resources
+TAG_FETCH_WORKERS = 10
+
+# Tags fetched per ARN, reused by warm invocations for TAG_CACHE_TTL_SECONDS: arn -> (monotonic time, tags)
+TAG_CACHE_TTL_SECONDS = float(os.environ.get('TAG_CACHE_TTL_SECONDS', '300'))
+_TAG_CACHE: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
+# Optional comma-separated tag keys (e.g. "StopWeekEnd,StartWeekEnd"); when set, only RDS
+# resources carrying at least one of them are returned by get_all_rds_resources. It must
+# include the tag key each handler schedules on, or that handler ignores it (with a warning)
+SCHEDULE_TAG_KEYS = [key.strip() for key in os.environ.get('SCHEDULE_TAG_KEYS', '').split(',') if key.strip()]
+
+# Adaptive retries back off client-side under RDS API throttling; the pool leaves room
+# for the tag fetch threads and keepalive lets warm invocations reuse connections
+_RDS_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10,
+    max_pool_connections=32
+)
+
+# boto3 clients shared by every RDSManager in the execution environment, keyed by (service, region)
+_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+
+
+def _get_client(service: str, region: str) -> Any:
+    """Return the cached boto3 client for a service and region, creating it on first use."""
+    client = _CLIENT_CACHE.get((service, region))
+    if client is None:
+        client = _CLIENT_CACHE[(service, region)] = boto3.client(
+            service, region_name=region, config=_RDS_CLIENT_CONFIG
+        )
+    return client
+
+
+def _setup_logger() -> logging.Logger:
+    """Set up structured logging."""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+    
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+        
+    return logger
+
+
+# Configured once per execution environment and shared by every RDSManager
+_LOGGER = _setup_logger()
+
 
 class RDSEngine(Enum):
     """Enumeration of supported RDS engines."""
@@ -40,6 +107,10 @@ class RDSStatus(Enum):
     MODIFYING = "modifying"
 
 
+# Engines that must be managed through the cluster APIs
+AURORA_ENGINES = frozenset({RDSEngine.AURORA_MYSQL.value, RDSEngine.AURORA_POSTGRESQL.value})
+
+
 @dataclass
 class RDSResource:
     """Data class representing an RDS resource (instance or cluster)."""
@@ -65,86 +136,216 @@ class RDSManager:
             region: AWS region. If None, uses AWS_REGION environment variable.
         """
         self.region = region or os.environ.get('AWS_REGION', 'us-east-1')
-        self.rds_client = boto3.client('rds', region_name=self.region)
-        self.logger = self._setup_logger()
-        
-    def _setup_logger(self) -> logging.Logger:
-        """Set up structured logging."""
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-            
-        return logger
+        self.rds_client = _get_client('rds', self.region)
+        self.tagging_client = _get_client('resourcegroupstaggingapi', self.region)
+        self.logger = _LOGGER
     
-    def get_all_rds_resources(self) -> Tuple[List[RDSResource], List[RDSResource]]:
+    def get_all_rds_resources(
+        self, engine_filter: Optional[List[str]] = None, tag_key: Optional[str] = None
+    ) -> Tuple[List[RDSResource], List[RDSResource]]:
         """
         Get all RDS instances and clusters with their metadata.
         
+        Args:
+            engine_filter: Engines to fetch (e.g. ['mysql', 'aurora-mysql']). If given, the
+                filter is applied server-side so other engines are never described or tagged.
+            tag_key: Tag key the caller schedules on. If SCHEDULE_TAG_KEYS is set but does not
+                include it, the shortlist is ignored so tagged resources are not silently dropped.
+                
         Returns:
             Tuple of (instances, clusters) as RDSResource objects.
         """
         instances = []
         clusters = []
         
-        try:
-            # Get all DB instances
-            paginator = self.rds_client.get_paginator('describe_db_instances')
-            for page in paginator.paginate():
-                for db in page['DBInstances']:
-                    try:
-                        tags = self._get_resource_tags(db['DBInstanceArn'])
-                        resource = RDSResource(
-                            identifier=db['DBInstanceIdentifier'],
-                            arn=db['DBInstanceArn'],
-                            engine=db['Engine'],
-                            status=db['DBInstanceStatus'],
-                            is_cluster=False,
-                            read_replicas=db.get('ReadReplicaDBInstanceIdentifiers', []),
-                            tags=tags
-                        )
-                        instances.append(resource)
-                    except Exception as e:
-                        self.logger.error(f"Error processing instance {db.get('DBInstanceIdentifier', 'unknown')}: {e}")
-                        
-        except ClientError as e:
-            self.logger.error(f"Error describing DB instances: {e}")
+        paginate_kwargs = {'Filters': [{'Name': 'engine', 'Values': engine_filter}]} if engine_filter else {}
+        
+        schedule_tag_keys = SCHEDULE_TAG_KEYS
+        if schedule_tag_keys and tag_key and tag_key not in schedule_tag_keys:
+            self.logger.warning(
+                f"SCHEDULE_TAG_KEYS {schedule_tag_keys} does not include {tag_key}; fetching all resources instead"
+            )
+            schedule_tag_keys = []
+        
+        # Describe DB instances and DB clusters (and shortlist scheduled resources) at the same
+        # time; all are network-bound
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            scheduled_future = (
+                executor.submit(self._get_tags_from_tagging_api, schedule_tag_keys)
+                if schedule_tag_keys else None
+            )
+            instances_future = executor.submit(
+                self._describe_all, 'describe_db_instances', 'DBInstances', 'DB instances', _INSTANCE_FIELDS,
+                **paginate_kwargs
+            )
+            clusters_future = executor.submit(
+                self._describe_all, 'describe_db_clusters', 'DBClusters', 'DB clusters', _CLUSTER_FIELDS,
+                **paginate_kwargs
+            )
+            instance_dbs = instances_future.result()
+            cluster_dbs = clusters_future.result()
+            scheduled_tags = scheduled_future.result() if scheduled_future else None
+        
+        if scheduled_tags is not None:
+            # Only resources carrying a schedule tag are kept, and their tags are already known
+            instance_dbs = [db for db in instance_dbs if db.get('DBInstanceArn') in scheduled_tags]
+            cluster_dbs = [db for db in cluster_dbs if db.get('DBClusterArn') in scheduled_tags]
+            tags_by_arn = scheduled_tags
+        else:
+            # Fetch tags for every resource up front instead of one call per resource while building
+            tags_by_arn = self._get_tags_for_arns(
+                [db.get('DBInstanceArn') for db in instance_dbs] +
+                [db.get('DBClusterArn') for db in cluster_dbs]
+            )
+        
+        for db in instance_dbs:
+            try:
+                resource = RDSResource(
+                    identifier=db['DBInstanceIdentifier'],
+                    arn=db['DBInstanceArn'],
+                    engine=db['Engine'],
+                    status=db['DBInstanceStatus'],
+                    is_cluster=False,
+                    read_replicas=db.get('ReadReplicaDBInstanceIdentifiers', []),
+                    tags=tags_by_arn[db['DBInstanceArn']]
+                )
+                instances.append(resource)
+            except Exception as e:
+                self.logger.error(f"Error processing instance {db.get('DBInstanceIdentifier', 'unknown')}: {e}")
+        
+        for db in cluster_dbs:
+            try:
+                resource = RDSResource(
+                    identifier=db['DBClusterIdentifier'],
+                    arn=db['DBClusterArn'],
+                    engine=db['Engine'],
+                    status=db['Status'],
+                    is_cluster=True,
+                    read_replicas=db.get('ReadReplicaIdentifiers', []),
+                    tags=tags_by_arn[db['DBClusterArn']]
+                )
+                clusters.append(resource)
+            except Exception as e:
+                self.logger.error(f"Error processing cluster {db.get('DBClusterIdentifier', 'unknown')}: {e}")
+            
+        self.logger.info(f"Found {len(instances)} instances and {len(clusters)} clusters")
+        return instances, clusters
+    
+    def _describe_all(
+        self,
+        operation: str,
+        result_key: str,
+        description: str,
+        fields: Tuple[str, ...],
+        **paginate_kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect every item from a paginated RDS describe call.
+        
+        Args:
+            operation: Paginated client operation, e.g. 'describe_db_instances'.
+            result_key: Response key holding the items of each page.
+            description: Human-readable name used in error messages.
+            fields: Keys to keep from each item; the rest of each large item is discarded.
+            **paginate_kwargs: Extra request parameters, such as Filters.
             
+        Returns:
+            List of projected items; items gathered before a ClientError are kept.
+        """
+        items = []
         try:
-            # Get all DB clusters
-            paginator = self.rds_client.get_paginator('describe_db_clusters')
-            for page in paginator.paginate():
-                for db in page['DBClusters']:
-                    try:
-                        tags = self._get_resource_tags(db['DBClusterArn'])
-                        resource = RDSResource(
-                            identifier=db['DBClusterIdentifier'],
-                            arn=db['DBClusterArn'],
-                            engine=db['Engine'],
-                            status=db['Status'],
-                            is_cluster=True,
-                            read_replicas=db.get('ReadReplicaIdentifiers', []),
-                            tags=tags
-                        )
-                        clusters.append(resource)
-                    except Exception as e:
-                        self.logger.error(f"Error processing cluster {db.get('DBClusterIdentifier', 'unknown')}: {e}")
-                        
+            paginator = self.rds_client.get_paginator(operation)
+            pages = paginator.paginate(PaginationConfig={'PageSize': DESCRIBE_PAGE_SIZE}, **paginate_kwargs)
+            for page in pages:
+                items.extend(
+                    {field: item[field] for field in fields if field in item}
+                    for item in page[result_key]
+                )
         except ClientError as e:
-            self.logger.error(f"Error describing DB clusters: {e}")
+            self.logger.error(f"Error describing {description}: {e}")
+        return items
+    
+    def _get_tags_for_arns(self, arns: List[Optional[str]]) -> Dict[str, Dict[str, str]]:
+        """
+        Get tags for several RDS resources.
+        
+        Fresh cached tags are reused; the rest come from one paginated Resource Groups
+        Tagging API stream, falling back to concurrent ListTagsForResource calls if that
+        API is unavailable.
+        
+        Args:
+            arns: ARNs of the RDS resources; missing (None) entries are ignored.
             
-        self.logger.info(f"Found {len(instances)} instances and {len(clusters)} clusters")
-        return instances, clusters
+        Returns:
+            Dictionary mapping each ARN whose tags could be fetched to its tags.
+        """
+        tags_by_arn = {}
+        missing = []
+        for arn in dict.fromkeys(arns):
+            if not arn:
+                continue
+            cached = _TAG_CACHE.get(arn)
+            if cached is not None and time.monotonic() - cached[0] < TAG_CACHE_TTL_SECONDS:
+                tags_by_arn[arn] = cached[1]
+            else:
+                missing.append(arn)
+        
+        if not missing:
+            return tags_by_arn
+        
+        all_tags = self._get_tags_from_tagging_api()
+        if all_tags is not None:
+            fetched_at = time.monotonic()
+            for arn in missing:
+                # Resources without any tags are not returned by the Tagging API
+                tags = all_tags.get(arn, {})
+                _TAG_CACHE[arn] = (fetched_at, tags)
+                tags_by_arn[arn] = tags
+            return tags_by_arn
+        
+        with ThreadPoolExecutor(max_workers=min(TAG_FETCH_WORKERS, len(missing))) as executor:
+            futures = {executor.submit(self._get_resource_tags, arn): arn for arn in missing}
+            for future in as_completed(futures):
+                arn = futures[future]
+                try:
+                    tags_by_arn[arn] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error getting tags for {arn}: {e}")
+        
+        return tags_by_arn
+    
+    def _get_tags_from_tagging_api(
+        self, tag_keys: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Get tags for all tagged RDS instances and clusters in the region.
+        
+        Args:
+            tag_keys: If given, only resources carrying at least one of these tag keys are
+                returned. The API ANDs multiple TagFilters, so each key is listed separately.
+                
+        Returns:
+            Dictionary mapping ARN to tags, or None if the Tagging API call failed.
+        """
+        filter_sets = [[{'Key': key}] for key in tag_keys] if tag_keys else [[]]
+        try:
+            tags_by_arn = {}
+            paginator = self.tagging_client.get_paginator('get_resources')
+            for tag_filters in filter_sets:
+                paginate_kwargs = {'TagFilters': tag_filters} if tag_filters else {}
+                for page in paginator.paginate(ResourceTypeFilters=['rds:db', 'rds:cluster'], **paginate_kwargs):
+                    for mapping in page['ResourceTagMappingList']:
+                        tags_by_arn[mapping['ResourceARN']] = {
+                            tag['Key']: tag['Value'] for tag in mapping.get('Tags', ())
+                        }
+            return tags_by_arn
+        except (ClientError, BotoCoreError) as e:
+            self.logger.warning(f"Tagging API unavailable, falling back to ListTagsForResource: {e}")
+            return None
     
     def _get_resource_tags(self, resource_arn: str) -> Dict[str, str]:
         """
-        Get tags for an RDS resource.
+        Get tags for an RDS resource, served from the module-level cache while fresh.
         
         Args:
             resource_arn: ARN of the RDS resource.
@@ -152,24 +353,31 @@ class RDSManager:
         Returns:
             Dictionary of tag key-value pairs.
         """
+        cached = _TAG_CACHE.get(resource_arn)
+        if cached is not None and time.monotonic() - cached[0] < TAG_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
             response = self.rds_client.list_tags_for_resource(ResourceName=resource_arn)
-            return {tag['Key']: tag['Value'] for tag in response['TagList']}
+            tags = {tag['Key']: tag['Value'] for tag in response['TagList']}
         except ClientError as e:
             self.logger.error(f"Error getting tags for {resource_arn}: {e}")
             return {}
+        
+        _TAG_CACHE[resource_arn] = (time.monotonic(), tags)
+        return tags
     
     def is_aurora_engine(self, engine: str) -> bool:
         """Check if the engine is Aurora."""
-        return engine in [RDSEngine.AURORA_MYSQL.value, RDSEngine.AURORA_POSTGRESQL.value]
+        return engine in AURORA_ENGINES
     
-    def is_read_replica(self, resource: RDSResource, all_read_replicas: List[str]) -> bool:
+    def is_read_replica(self, resource: RDSResource, all_read_replicas: Set[str]) -> bool:
         """
         Check if a resource is a read replica.
         
         Args:
             resource: RDS resource to check.
-            all_read_replicas: List of all read replica identifiers.
+            all_read_replicas: Set of all read replica identifiers.
             
         Returns:
             True if the resource is a read replica.
@@ -177,20 +385,17 @@ class RDSManager:
         return (resource.identifier in all_read_replicas or 
                 len(resource.read_replicas) > 0)
     
-    def get_all_read_replicas(self, resources: List[RDSResource]) -> List[str]:
+    def get_all_read_replicas(self, resources: Iterable[RDSResource]) -> Set[str]:
         """
         Get all read replica identifiers from a list of resources.
         
         Args:
-            resources: List of RDS resources.
+            resources: Iterable of RDS resources.
             
         Returns:
-            List of read replica identifiers.
+            Set of read replica identifiers, for constant-time membership checks.
         """
-        read_replicas = []
-        for resource in resources:
-            read_replicas.extend(resource.read_replicas)
-        return read_replicas
+        return {replica for resource in resources for replica in resource.read_replicas}
     
     def start_rds_resource(self, resource: RDSResource) -> bool:
         """
@@ -303,43 +508,76 @@ class TimeZoneManager:
             time.tzset()
             return 'UTC'
     
-    def is_time_in_range(self, target_time: str, tolerance_minutes: int = 5) -> bool:
+    def is_time_in_range(
+        self,
+        target_time: str,
+        tolerance_minutes: int = 5,
+        now: Optional[datetime.datetime] = None
+    ) -> bool:
         """
         Check if current time is within the target time range.
         
         Args:
             target_time: Target time in HH:MM format.
             tolerance_minutes: Tolerance in minutes (default: 5).
+            now: Current time; read from the clock if not given, so callers checking many
+                resources can share one reading.
             
         Returns:
             True if current time is within the target range.
         """
         try:
-            now = datetime.datetime.now()
-            current_time = now.strftime('%H:%M')
+            if now is None:
+                now = datetime.datetime.now()
+            current_minutes = now.hour * 60 + now.minute
             
-            # Calculate time range
-            time_minus = (now - datetime.timedelta(minutes=tolerance_minutes)).strftime('%H:%M')
-            time_plus = (now + datetime.timedelta(minutes=tolerance_minutes)).strftime('%H:%M')
+            hours, minutes = target_time.split(':')
+            target_minutes = int(hours) * 60 + int(minutes)
             
-            # Handle day boundary crossing
-            if time_minus <= time_plus:
-                return time_minus <= target_time <= time_plus
-            else:
-                # Crosses midnight
-                return target_time >= time_minus or target_time <= time_plus
+            # Offset from the start of the window on the 24h clock, so windows that cross
+            # midnight need no special case
+            return (target_minutes - current_minutes + tolerance_minutes) % 1440 <= 2 * tolerance_minutes
                 
         except Exception as e:
             self.logger.error(f"Error checking time range for {target_time}: {e}")
             return False
     
-    def is_weekday(self) -> bool:
-        """Check if current day is a weekday (Monday-Friday)."""
-        return 1 <= datetime.datetime.now().isoweekday() <= 5
+    def is_weekday(self, now: Optional[datetime.datetime] = None) -> bool:
+        """Check if current day (or now, if given) is a weekday (Monday-Friday)."""
+        return 1 <= (now or datetime.datetime.now()).isoweekday() <= 5
     
-    def is_weekend(self) -> bool:
-        """Check if current day is a weekend (Saturday-Sunday)."""
-        return 6 <= datetime.datetime.now().isoweekday() <= 7
+    def is_weekend(self, now: Optional[datetime.datetime] = None) -> bool:
+        """Check if current day (or now, if given) is a weekend (Saturday-Sunday)."""
+        return 6 <= (now or datetime.datetime.now()).isoweekday() <= 7
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_time_tag(tag_value: str) -> Optional[str]:
+    """
+    Normalize an H:MM or HH:MM tag value to HH:MM.
+    
+    Cached on the raw value, since many resources share the same schedule times.
+    
+    Args:
+        tag_value: Stripped, non-empty tag value.
+        
+    Returns:
+        Time string in HH:MM format or None if invalid.
+    """
+    try:
+        time_parts = tag_value.split(':')
+        if len(time_parts) != 2:
+            raise ValueError("Invalid format")
+            
+        hours, minutes = int(time_parts[0]), int(time_parts[1])
+        
+        if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+            raise ValueError("Invalid time values")
+            
+        return f"{hours:02d}:{minutes:02d}"
+        
+    except ValueError:
+        return None
 
 
 class TagProcessor:
@@ -347,7 +585,8 @@ class TagProcessor:
     Enhanced tag processing with validation and better error handling.
     """
     
-    VALID_BOOLEAN_VALUES = {'true', 'false', '1', '0', 'yes', 'no', 'on', 'off'}
+    VALID_BOOLEAN_VALUES = frozenset({'true', 'false', '1', '0', 'yes', 'no', 'on', 'off'})
+    TRUE_VALUES = frozenset({'true', '1', 'yes', 'on'})
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -372,7 +611,7 @@ class TagProcessor:
             self.logger.warning(f"Invalid boolean value for tag {tag_key}: {tag_value}")
             return None
             
-        return tag_value in {'true', '1', 'yes', 'on'}
+        return tag_value in self.TRUE_VALUES
     
     def get_time_tag_value(self, tags: Dict[str, str], tag_key: str) -> Optional[str]:
         """
@@ -389,24 +628,11 @@ class TagProcessor:
         
         if not tag_value:
             return None
-            
-        # Validate HH:MM format
-        try:
-            time_parts = tag_value.split(':')
-            if len(time_parts) != 2:
-                raise ValueError("Invalid format")
-                
-            hours, minutes = int(time_parts[0]), int(time_parts[1])
-            
-            if not (0 <= hours <= 23 and 0 <= minutes <= 59):
-                raise ValueError("Invalid time values")
-                
-            return f"{hours:02d}:{minutes:02d}"
-            
-        except (ValueError, IndexError) as e:
+        
+        time_value = _parse_time_tag(tag_value)
+        if time_value is None:
             self.logger.warning(f"Invalid time format for tag {tag_key}: {tag_value}")
-            return None
-
+        return time_value
 
 def create_lambda_response(success: bool, message: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
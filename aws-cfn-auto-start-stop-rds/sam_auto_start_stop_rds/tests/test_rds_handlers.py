@@ -0,0 +1,165 @@
+"""
+Unit tests for the improved RDS Lambda handlers.
+
+Covers the per-resource scheduling decisions made by the handlers, using mocked
+AWS clients so no RDS API is called.
+
+Author: Improved by AI Assistant
+Version: 2.0.0
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+from datetime import datetime
+import os
+import sys
+
+# Add the lambda_layer and the handlers to the path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_layer', 'python'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda'))
+
+from rds_utils import AURORA_ENGINES, RDSManager, RDSResource, TagProcessor, TimeZoneManager
+import RDSStopWeekEnd_improved
+
+
+def make_resource(identifier, engine="mysql", is_cluster=False, read_replicas=None, tags=None, status="available"):
+    """Build an RDSResource with defaults suitable for the handler tests."""
+    kind = "cluster" if is_cluster else "db"
+    return RDSResource(
+        identifier=identifier,
+        arn=f"arn:aws:rds:us-east-1:123456789012:{kind}:{identifier}",
+        engine=engine,
+        status=status,
+        is_cluster=is_cluster,
+        read_replicas=read_replicas or [],
+        tags=tags if tags is not None else {"StopWeekEnd": "22:00"}
+    )
+
+
+class TestStopWeekEndClassifyResource(unittest.TestCase):
+    """Test RDSStopWeekEnd_improved.classify_resource."""
+
+    # Saturday, on the scheduled stop time
+    NOW = datetime(2024, 1, 6, 22, 0)
+
+    def setUp(self):
+        with patch('rds_utils._get_client'):
+            self.rds_manager = RDSManager('us-east-1')
+        self.tag_processor = TagProcessor()
+        self.tz_manager = TimeZoneManager()
+
+    def classify(self, resource, all_read_replicas=frozenset()):
+        return RDSStopWeekEnd_improved.classify_resource(
+            resource, self.rds_manager, self.tag_processor, self.tz_manager, set(all_read_replicas), self.NOW
+        )
+
+    def test_due_instance_is_stopped(self):
+        """Test a non-Aurora instance tagged for now is due to stop."""
+        self.assertEqual(self.classify(make_resource("db-1")), ("22:00", None))
+
+    def test_due_aurora_cluster_is_stopped(self):
+        """Test an Aurora cluster tagged for now is due to stop."""
+        resource = make_resource("cluster-1", engine="aurora-mysql", is_cluster=True, tags={"StopWeekEnd": "21:58"})
+        self.assertEqual(self.classify(resource), ("21:58", None))
+
+    def test_read_replica_skipped(self):
+        """Test replicas and sources of replicas are skipped before the tag is read."""
+        self.assertEqual(
+            self.classify(make_resource("replica-1"), all_read_replicas={"replica-1"}),
+            (None, 'Read replica - cannot be stopped independently')
+        )
+        self.assertEqual(
+            self.classify(make_resource("source-1", read_replicas=["replica-1"])),
+            (None, 'Read replica - cannot be stopped independently')
+        )
+
+    def test_missing_or_invalid_tag_skipped(self):
+        """Test resources without a usable StopWeekEnd tag are skipped."""
+        for tags in ({}, {"StopWeekEnd": ""}, {"StopWeekEnd": "25:00"}, {"StopWeekEnd": "late"}, {"StartWeekEnd": "22:00"}):
+            with self.subTest(tags=tags):
+                self.assertEqual(
+                    self.classify(make_resource("db-1", tags=tags)),
+                    (None, 'StopWeekEnd tag not set or invalid format')
+                )
+
+    def test_outside_window_skipped(self):
+        """Test resources scheduled outside the tolerance window are skipped."""
+        for stop_time in ("21:54", "22:06", "10:00"):
+            with self.subTest(stop_time=stop_time):
+                self.assertEqual(
+                    self.classify(make_resource("db-1", tags={"StopWeekEnd": stop_time})),
+                    (None, f'Not scheduled time (scheduled: {stop_time})')
+                )
+
+    def test_non_aurora_cluster_skipped(self):
+        """Test a cluster with a non-Aurora engine is skipped."""
+        resource = make_resource("cluster-1", engine="mysql", is_cluster=True)
+        self.assertEqual(self.classify(resource), (None, 'Non-Aurora engine in cluster format'))
+
+    def test_aurora_instance_skipped(self):
+        """Test an Aurora instance is left to its cluster."""
+        resource = make_resource("db-1", engine="aurora-postgresql")
+        self.assertEqual(self.classify(resource), (None, 'Aurora engine should be managed as cluster'))
+
+
+class TestStopWeekEndHandler(unittest.TestCase):
+    """Test the parallel stop path of RDSStopWeekEnd_improved.lambda_handler."""
+
+    def setUp(self):
+        self.resources = [
+            make_resource("db-stopped"),
+            make_resource("db-busy", status="backing-up"),
+            make_resource("db-broken")
+        ]
+        rds_manager = Mock()
+        rds_manager.get_all_rds_resources.return_value = (self.resources, [])
+        rds_manager.get_all_read_replicas.return_value = set()
+        rds_manager.is_read_replica.return_value = False
+        rds_manager.is_aurora_engine.side_effect = lambda engine: engine in AURORA_ENGINES
+
+        def stop_rds_resource(resource):
+            if resource.identifier == "db-broken":
+                raise RuntimeError("throttled")
+            return resource.status == "available"
+
+        rds_manager.stop_rds_resource.side_effect = stop_rds_resource
+        self.rds_manager = rds_manager
+
+        # Every resource is due: run on a weekend, inside each schedule window
+        for patcher in (
+            patch.object(RDSStopWeekEnd_improved, 'RDSManager', return_value=rds_manager),
+            patch.object(TimeZoneManager, 'set_timezone', return_value='UTC'),
+            patch.object(TimeZoneManager, 'is_weekend', return_value=True),
+            patch.object(TimeZoneManager, 'is_time_in_range', return_value=True)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_stop_results_are_classified(self):
+        """Test a True result is stopped, False is skipped and an exception is an error."""
+        response = RDSStopWeekEnd_improved.lambda_handler({}, None)
+        details = response['details']
+
+        self.assertEqual(self.rds_manager.stop_rds_resource.call_count, 3)
+        self.assertFalse(response['success'])
+        self.assertEqual([r['identifier'] for r in details['stopped_resources']], ["db-stopped"])
+        self.assertEqual(details['skipped_resources'], [
+            {'identifier': "db-busy", 'reason': 'Not in available state (current: backing-up)'}
+        ])
+        self.assertEqual(details['error_resources'], [{'identifier': "db-broken", 'error': "throttled"}])
+        self.assertEqual(details['total_processed'], 3)
+
+    def test_all_stopped_succeeds(self):
+        """Test the invocation succeeds when every due resource stops."""
+        self.rds_manager.stop_rds_resource.side_effect = None
+        self.rds_manager.stop_rds_resource.return_value = True
+
+        response = RDSStopWeekEnd_improved.lambda_handler({}, None)
+
+        self.assertTrue(response['success'])
+        self.assertEqual(response['details']['stopped_count'], 3)
+        self.assertEqual(response['details']['error_resources'], [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -11,6 +11,7 @@ Version: 2.0.0
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import boto3
+from botocore.exceptions import ClientError
 from moto import mock_rds
 import pytest
 from datetime import datetime, timedelta
@@ -110,23 +111,36 @@ class TestTimeZoneManager(unittest.TestCase):
     
     def test_is_time_in_range(self):
         """Test time range checking."""
-        # Mock current time to 10:00
-        with patch('datetime.datetime') as mock_datetime:
-            mock_now = Mock()
-            mock_now.strftime.return_value = "10:00"
-            mock_datetime.now.return_value = mock_now
-            mock_datetime.timedelta = timedelta
-            
-            # Mock timedelta operations
-            mock_minus = Mock()
-            mock_minus.strftime.return_value = "09:55"
-            mock_plus = Mock()
-            mock_plus.strftime.return_value = "10:05"
-            
-            # Test time within range
-            self.assertTrue(self.tz_manager.is_time_in_range("10:00"))
-            self.assertTrue(self.tz_manager.is_time_in_range("09:58"))
-            self.assertTrue(self.tz_manager.is_time_in_range("10:03"))
+        now = datetime(2024, 1, 1, 10, 0)
+        
+        # Test time within range
+        self.assertTrue(self.tz_manager.is_time_in_range("10:00", now=now))
+        self.assertTrue(self.tz_manager.is_time_in_range("09:58", now=now))
+        self.assertTrue(self.tz_manager.is_time_in_range("10:03", now=now))
+        self.assertTrue(self.tz_manager.is_time_in_range("10:05", now=now))
+        
+        # Test time outside range
+        self.assertFalse(self.tz_manager.is_time_in_range("10:06", now=now))
+        self.assertFalse(self.tz_manager.is_time_in_range("09:54", now=now))
+    
+    def test_is_time_in_range_across_midnight(self):
+        """Test time range checking when the window crosses midnight."""
+        now = datetime(2024, 1, 1, 23, 58)
+        
+        self.assertTrue(self.tz_manager.is_time_in_range("00:02", now=now))
+        self.assertTrue(self.tz_manager.is_time_in_range("23:55", now=now))
+        self.assertFalse(self.tz_manager.is_time_in_range("00:04", now=now))
+        self.assertFalse(self.tz_manager.is_time_in_range("12:00", now=now))
+    
+    def test_weekday_weekend_with_now(self):
+        """Test day checks against a supplied time."""
+        saturday = datetime(2024, 1, 6, 12, 0)
+        monday = datetime(2024, 1, 8, 12, 0)
+        
+        self.assertTrue(self.tz_manager.is_weekend(saturday))
+        self.assertFalse(self.tz_manager.is_weekday(saturday))
+        self.assertTrue(self.tz_manager.is_weekday(monday))
+        self.assertFalse(self.tz_manager.is_weekend(monday))
     
     @patch('datetime.datetime')
     def test_is_weekday(self, mock_datetime):
@@ -152,12 +166,20 @@ class TestTimeZoneManager(unittest.TestCase):
 
 
 @mock_rds
+@patch.dict('rds_utils._TAG_CACHE', clear=True)
+@patch.dict('rds_utils._CLIENT_CACHE', clear=True)
 class TestRDSManager(unittest.TestCase):
     """Test RDSManager functionality with mocked AWS services."""
     
     def setUp(self):
         self.rds_manager = RDSManager(region='us-east-1')
         
+        # moto's Tagging API backend is not used here; default to an empty tag listing
+        self.rds_manager.tagging_client = Mock()
+        self.rds_manager.tagging_client.get_paginator.return_value.paginate.return_value = [
+            {'ResourceTagMappingList': []}
+        ]
+        
         # Create mock RDS client
         self.rds_client = boto3.client('rds', region_name='us-east-1')
         
@@ -181,6 +203,145 @@ class TestRDSManager(unittest.TestCase):
                 self.assertEqual(len(clusters), 0)
                 self.assertEqual(instances[0].identifier, 'test-db')
     
+    def test_get_all_rds_resources_engine_filter(self):
+        """Test the engine filter is applied to both describe calls."""
+        self.rds_client.create_db_instance(
+            DBInstanceIdentifier='test-pg',
+            DBInstanceClass='db.t3.micro',
+            Engine='postgres',
+            MasterUsername='admin',
+            MasterUserPassword='password123',
+            AllocatedStorage=20
+        )
+        
+        with patch.object(self.rds_manager, 'rds_client', self.rds_client):
+            instances, clusters = self.rds_manager.get_all_rds_resources(engine_filter=['postgres'])
+        
+        self.assertEqual([i.identifier for i in instances], ['test-pg'])
+        self.assertEqual(clusters, [])
+    
+    def test_describe_all_keeps_only_projected_fields(self):
+        """Test described items are trimmed to the requested fields."""
+        with patch.object(self.rds_manager, 'rds_client', self.rds_client):
+            items = self.rds_manager._describe_all(
+                'describe_db_instances', 'DBInstances', 'DB instances', ('DBInstanceIdentifier', 'Engine')
+            )
+        
+        self.assertEqual(items, [{'DBInstanceIdentifier': 'test-db', 'Engine': 'mysql'}])
+    
+    def test_get_all_rds_resources_fetches_tags(self):
+        """Test tags are fetched for every instance and cluster and attached to the right resource."""
+        self.rds_client.add_tags_to_resource(
+            ResourceName=self.rds_client.describe_db_instances()['DBInstances'][0]['DBInstanceArn'],
+            Tags=[{'Key': 'AutoStart', 'Value': 'true'}]
+        )
+        self.rds_client.create_db_cluster(
+            DBClusterIdentifier='test-cluster',
+            Engine='aurora-mysql',
+            MasterUsername='admin',
+            MasterUserPassword='password123',
+            Tags=[{'Key': 'AutoStop', 'Value': 'true'}]
+        )
+        
+        # Force the per-ARN ListTagsForResource fallback
+        self.rds_manager.tagging_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}}, 'GetResources'
+        )
+        
+        with patch.object(self.rds_manager, 'rds_client', self.rds_client):
+            instances, clusters = self.rds_manager.get_all_rds_resources()
+        
+        self.assertEqual(instances[0].tags, {'AutoStart': 'true'})
+        self.assertEqual(clusters[0].identifier, 'test-cluster')
+        self.assertEqual(clusters[0].tags, {'AutoStop': 'true'})
+    
+    @patch('rds_utils.SCHEDULE_TAG_KEYS', ['StopWeekEnd', 'StartWeekEnd'])
+    def test_get_all_rds_resources_schedule_tag_shortlist(self):
+        """Test only resources with a schedule tag are returned, using the Tagging API tags."""
+        arn = self.rds_client.describe_db_instances()['DBInstances'][0]['DBInstanceArn']
+        self.rds_client.create_db_instance(
+            DBInstanceIdentifier='unscheduled-db',
+            DBInstanceClass='db.t3.micro',
+            Engine='mysql',
+            MasterUsername='admin',
+            MasterUserPassword='password123',
+            AllocatedStorage=20
+        )
+        paginate = self.rds_manager.tagging_client.get_paginator.return_value.paginate
+        paginate.side_effect = lambda **kwargs: [{'ResourceTagMappingList': [
+            {'ResourceARN': arn, 'Tags': [{'Key': 'StopWeekEnd', 'Value': '22:00'}]}
+        ] if kwargs['TagFilters'] == [{'Key': 'StopWeekEnd'}] else []}]
+        
+        with patch.object(self.rds_manager, 'rds_client', self.rds_client), \
+                patch.object(self.rds_manager, '_get_tags_for_arns') as mock_get_tags:
+            instances, clusters = self.rds_manager.get_all_rds_resources()
+        
+        self.assertEqual([i.identifier for i in instances], ['test-db'])
+        self.assertEqual(instances[0].tags, {'StopWeekEnd': '22:00'})
+        self.assertEqual(clusters, [])
+        self.assertEqual(paginate.call_count, 2)
+        mock_get_tags.assert_not_called()
+    
+    @patch('rds_utils.SCHEDULE_TAG_KEYS', ['StopWeekEnd', 'StartWeekEnd'])
+    def test_get_all_rds_resources_shortlist_ignored_for_other_tag_key(self):
+        """Test a caller whose tag key is not in SCHEDULE_TAG_KEYS still sees every resource."""
+        paginate = self.rds_manager.tagging_client.get_paginator.return_value.paginate
+        
+        with patch.object(self.rds_manager, 'rds_client', self.rds_client), \
+                patch.object(self.rds_manager, '_get_tags_for_arns', side_effect=lambda arns: dict.fromkeys(arns, {})), \
+                self.assertLogs(level='WARNING') as logs:
+            instances, clusters = self.rds_manager.get_all_rds_resources(tag_key='AutoStart')
+        
+        self.assertEqual([i.identifier for i in instances], ['test-db'])
+        paginate.assert_not_called()
+        self.assertIn('does not include AutoStart', logs.output[0])
+    
+    def test_get_tags_for_arns_uses_tagging_api(self):
+        """Test tags come from one Tagging API listing instead of per-ARN calls."""
+        tagged = "arn:aws:rds:us-east-1:123456789012:db:tagged-db"
+        untagged = "arn:aws:rds:us-east-1:123456789012:cluster:untagged"
+        self.rds_manager.tagging_client.get_paginator.return_value.paginate.return_value = [
+            {'ResourceTagMappingList': [
+                {'ResourceARN': tagged, 'Tags': [{'Key': 'AutoStart', 'Value': 'true'}]}
+            ]}
+        ]
+        mock_client = Mock()
+        
+        with patch.object(self.rds_manager, 'rds_client', mock_client):
+            tags_by_arn = self.rds_manager._get_tags_for_arns([tagged, untagged, None])
+        
+        self.assertEqual(tags_by_arn, {tagged: {'AutoStart': 'true'}, untagged: {}})
+        mock_client.list_tags_for_resource.assert_not_called()
+        self.rds_manager.tagging_client.get_paginator.return_value.paginate.assert_called_once_with(
+            ResourceTypeFilters=['rds:db', 'rds:cluster']
+        )
+    
+    def test_get_resource_tags_cached(self):
+        """Test tags are served from the cache until the TTL expires."""
+        arn = "arn:aws:rds:us-east-1:123456789012:db:test-db"
+        mock_client = Mock()
+        mock_client.list_tags_for_resource.return_value = {'TagList': [{'Key': 'AutoStart', 'Value': 'true'}]}
+        
+        with patch.object(self.rds_manager, 'rds_client', mock_client):
+            self.assertEqual(self.rds_manager._get_resource_tags(arn), {'AutoStart': 'true'})
+            self.assertEqual(self.rds_manager._get_resource_tags(arn), {'AutoStart': 'true'})
+            mock_client.list_tags_for_resource.assert_called_once_with(ResourceName=arn)
+            
+            with patch('rds_utils.TAG_CACHE_TTL_SECONDS', 0):
+                self.rds_manager._get_resource_tags(arn)
+            self.assertEqual(mock_client.list_tags_for_resource.call_count, 2)
+    
+    @patch('boto3.client')
+    def test_client_shared_per_region(self, mock_boto_client):
+        """Test managers in the same region reuse one client per service."""
+        first = RDSManager(region='eu-west-1')
+        second = RDSManager(region='eu-west-1')
+        
+        self.assertIs(first.rds_client, second.rds_client)
+        self.assertIs(first.tagging_client, second.tagging_client)
+        self.assertEqual(mock_boto_client.call_count, 2)
+        self.assertEqual(mock_boto_client.call_args_list[0].kwargs['config'].retries['mode'], 'adaptive')
+    
     def test_is_aurora_engine(self):
         """Test Aurora engine detection."""
         self.assertTrue(self.rds_manager.is_aurora_engine('aurora-mysql'))